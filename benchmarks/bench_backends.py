@@ -0,0 +1,119 @@
+# benchmarks/bench_backends.py
+#
+# Accuracy against a hand-labeled sample (benchmarks/labeled_descriptions.csv),
+# agreement with the fp32 pytorch pipeline, load time and throughput for each
+# classifier backend. Backends whose optional dependencies are missing, or whose
+# model cannot be downloaded, are reported and skipped.
+#
+#   python -m benchmarks.bench_backends [--backends pytorch quantized onnx embedding] [--threads 4] [--repeat 4]
+#   python -m benchmarks.bench_backends --local    # random-weight stand-ins, no Hugging Face hub needed
+#
+# --local builds untrained models with the default models' architectures
+# (distilbert-base for the NLI backends, MiniLM-L6 for embedding) and a vocabulary
+# covering the sample. Their labels are noise, so accuracy is chance level, but the
+# cost per description and how closely quantized/onnx reproduce the fp32 model are real.
+#
+# Results, 2026-10-18: --local --repeat 2, 1 CPU core, torch 2.14, transformers 5.19,
+# torchao 0.18, onnxruntime 1.31, 60 labeled descriptions, 17 candidate labels.
+#
+#   Backend     Agrees with pytorch   Load (s)   Descriptions/s
+#   pytorch     100.0%                0.1          1.2
+#   quantized    96.7%                0.6          1.9
+#   onnx        100.0%                4.4          2.7
+#   embedding    51.7%                0.1        352.9
+#
+# Accuracy was 5-7% for every backend, which is chance for 17 labels with random weights.
+# The embedding row is a different model, so its agreement says nothing about quality.
+# The cost per pass should carry over to the real checkpoints, which have the same shapes;
+# quantized changed 2 of the 60 labels of the untrained model. The real checkpoints could
+# not be downloaded here, so accuracy on the sample is still unmeasured. Until that run is recorded, none of
+# quantized, onnx or embedding should replace the pytorch default.
+
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+from tabulate import tabulate
+
+from benchmarks.synthetic import write_random_model
+from src.base_bank import BaseBank
+from src.classifier import BACKENDS, DEFAULT_MODELS, clear_classifiers, get_classifier
+
+LABELED_SAMPLE = 'benchmarks/labeled_descriptions.csv'
+
+
+class BenchBank(BaseBank):
+    def parse_csv(self):
+        pass
+
+
+def local_models(folder, descriptions):
+    # Backend -> path of a random-weight model shaped like its default model
+    bank = BenchBank("Bench", "bench.csv")
+    texts = list(descriptions) + bank.candidate_labels + ['This example is {}.']
+    nli = write_random_model(f"{folder}/nli", 'nli', texts)
+    embedding = write_random_model(f"{folder}/embedding", 'embedding', texts)
+    return {'pytorch': nli, 'quantized': nli, 'onnx': nli, 'embedding': embedding}
+
+
+def run(backend, model, descriptions, args):
+    bank = BenchBank("Bench", "bench.csv")
+    bank.model_name = model
+    bank.backend = backend
+    bank.threads = args.threads
+
+    start = time.perf_counter()
+    get_classifier(bank.model_name, backend, args.threads)
+    load_s = time.perf_counter() - start
+
+    # The labeled sample is small, so it is repeated to get a stable throughput figure
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        labels = bank.classify_descriptions(descriptions, args.batch_size)
+    elapsed = time.perf_counter() - start
+    return load_s, len(descriptions) * args.repeat / elapsed, labels
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--threads', type=int)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=4)
+    parser.add_argument('--local', action='store_true', help="benchmark random-weight stand-ins of the default models")
+    args = parser.parse_args()
+
+    sample = pd.read_csv(LABELED_SAMPLE)
+    descriptions = sample['description'].tolist()
+
+    with tempfile.TemporaryDirectory() as folder:
+        models = local_models(folder, descriptions) if args.local else DEFAULT_MODELS
+        rows = compare(args, models, sample)
+    print(tabulate(rows, headers=['Backend', 'Accuracy', 'Agrees with pytorch', 'Load (s)', 'Descriptions/s'],
+                   tablefmt='psql'))
+
+
+def compare(args, models, sample):
+    descriptions = sample['description'].tolist()
+    rows = []
+    reference = None
+    for backend in args.backends:
+        try:
+            load_s, throughput, labels = run(backend, models[backend], descriptions, args)
+        except (ImportError, OSError) as e:
+            print(f"Skipping {backend}: {e}")
+            continue
+        finally:
+            clear_classifiers()
+        labels = pd.Series(labels)
+        if backend == 'pytorch':
+            reference = labels
+        agreement = f"{(labels == reference).mean():.1%}" if reference is not None else "-"
+        rows.append([backend, f"{(labels == sample['category']).mean():.1%}", agreement,
+                     f"{load_s:.1f}", f"{throughput:.1f}"])
+    return rows
+
+
+if __name__ == "__main__":
+    main()
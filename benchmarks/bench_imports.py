@@ -0,0 +1,51 @@
+# benchmarks/bench_imports.py
+#
+# Import cost of the entry points, measured with `python -X importtime` in a
+# fresh interpreter. Lists the most expensive modules and whether any of the
+# heavy optional dependencies were pulled in at import time.
+#
+#   python -m benchmarks.bench_imports [--modules main src.base_bank src.plotting] [--top 10]
+
+import argparse
+import subprocess
+import sys
+
+from tabulate import tabulate
+
+# Only loaded on first use: the classifier backends and the plot renderers
+HEAVY_MODULES = ('torch', 'transformers', 'onnxruntime', 'optimum', 'matplotlib', 'seaborn')
+
+
+def import_times(module):
+    # {module: (self_us, cumulative_us)} for everything `import module` loads
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                         capture_output=True, text=True, check=True)
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def heavy_imports(times):
+    return sorted({name for name in times if name.split('.')[0] in HEAVY_MODULES})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modules', nargs='+', default=['main', 'src.base_bank', 'src.plotting'])
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        times = import_times(module)
+        print(f"\n{module}: {times[module][1] / 1000:.1f} ms, heavy modules: {heavy_imports(times) or 'none'}")
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        print(tabulate([[name, f"{s / 1000:.1f}", f"{c / 1000:.1f}"] for name, (s, c) in slowest],
+                       headers=['Module', 'Self (ms)', 'Cumulative (ms)'], tablefmt='psql'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/bench_memory.py
+#
+# Per-row memory of a standardized bank frame before and after
+# compact_transactions. "Before" is the layout the pipeline used to keep:
+# object strings plus the Income/Expense helper columns.
+#
+#   python -m benchmarks.bench_memory [--rows 1000000]
+
+import argparse
+import time
+
+from tabulate import tabulate
+
+from benchmarks.synthetic import synthetic_transactions
+from src.schema import combine_transactions, compact_transactions
+
+
+def per_row(df):
+    return df.memory_usage(deep=True, index=False).sum() / len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    before = synthetic_transactions(args.rows)
+    before['Category'] = before['Description'].map(lambda d: 'Groceries' if 'Mercadona' in d else 'Other')
+    before['Income'] = before['Amount'].where(before['Amount'] > 0, 0)
+    before['Expense'] = before['Amount'].where(before['Amount'] < 0, 0)
+
+    after = compact_transactions(before.drop(columns=['Income', 'Expense']))
+
+    rows = [
+        ["Before", f"{per_row(before):.1f}", f"{before.memory_usage(deep=True).sum() / 2**20:.1f}"],
+        ["After", f"{per_row(after):.1f}", f"{after.memory_usage(deep=True).sum() / 2**20:.1f}"],
+    ]
+    print(tabulate(rows, headers=['Layout', 'Bytes/row', 'Total (MB)'], tablefmt='psql'))
+
+    half = len(after) // 2
+    start = time.perf_counter()
+    combine_transactions([after.iloc[:half], after.iloc[half:]])
+    print(f"combine_transactions of two halves: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
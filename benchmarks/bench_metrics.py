@@ -0,0 +1,55 @@
+# benchmarks/bench_metrics.py
+#
+# Vectorized period_metrics against the previous row-wise implementation of
+# BaseBank.average_metric_per_month.
+#
+#   python -m benchmarks.bench_metrics [--rows 10000 100000 1000000]
+
+import argparse
+import time
+
+from tabulate import tabulate
+
+from benchmarks.synthetic import synthetic_transactions
+from src.metrics import period_metrics
+
+
+def legacy_average_metric_per_month(df):
+    df['Income'] = df['Amount'].apply(lambda x: x if x > 0 else 0)
+    df['Expense'] = df['Amount'].apply(lambda x: x if x < 0 else 0)
+    metrics_per_month = df.groupby('YearMonth').agg({
+        'Income': 'sum',
+        'Expense': 'sum',
+        'Balance': ['first', 'last']
+    }).reset_index()
+    metrics_per_month.columns = ['YearMonth', 'Total_Income', 'Total_Expense', 'Balance_Beginning', 'Balance_Ending']
+    metrics_per_month['Total_Expense'] = metrics_per_month['Total_Expense'].abs()
+    return metrics_per_month
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    rows = []
+    for n in args.rows:
+        df = synthetic_transactions(n)
+        legacy_s, _ = timed(legacy_average_metric_per_month, df.copy())
+        monthly_s, _ = timed(period_metrics, df, 'M')
+        weekly_s, _ = timed(period_metrics, df, 'W')
+        daily_s, _ = timed(period_metrics, df, 'D')
+        rows.append([n, f"{legacy_s:.3f}", f"{monthly_s:.3f}", f"{legacy_s / monthly_s:.1f}x",
+                     f"{weekly_s:.3f}", f"{daily_s:.3f}"])
+    print(tabulate(rows, headers=['Rows', 'Legacy (s)', 'Monthly (s)', 'Speedup', 'Weekly (s)', 'Daily (s)'],
+                   tablefmt='psql'))
+
+
+if __name__ == "__main__":
+    main()
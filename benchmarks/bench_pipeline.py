@@ -0,0 +1,159 @@
+# benchmarks/bench_pipeline.py
+#
+# End-to-end benchmark suite over synthetic Openbank and Revolut exports:
+# parse_csv, to_standard, categorize_expenses (stub model, and the real
+# zero-shot pipeline with --real), average_metric_per_month and the plotting
+# functions. Results are written to benchmarks/results/<label>.json; pass
+# --compare with an earlier results file to flag regressions.
+#
+#   python -m benchmarks.bench_pipeline [--rows 10000 100000] [--cardinality 50 5000] [--real]
+#   python -m benchmarks.bench_pipeline --label after --compare benchmarks/results/before.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+from tabulate import tabulate
+
+from benchmarks.bench_rules import StubClassifier
+from benchmarks.synthetic import write_export
+from src.openbank import Openbank
+from src.plotting import plot_balances, plot_expense_categories, plot_income_vs_expenses
+from src.revolut import Revolut
+
+RESULTS_FOLDER = 'benchmarks/results'
+BANKS = {'Openbank': Openbank, 'Revolut': Revolut}
+KEY = ['bank', 'rows', 'cardinality', 'case']
+
+
+def best_of(setup, func, repeat):
+    # Minimum wall time over `repeat` runs, each on fresh state from setup()
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        func(state)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def standardized_bank(cls, path, df, classifier=None):
+    bank = cls(cls.__name__, path)
+    bank.df = df.copy()
+    if classifier is not None:
+        bank.classifier = classifier
+    return bank
+
+
+def categorized(bank):
+    bank.categorize_expenses()
+    if 'Category' not in bank.df:
+        raise RuntimeError(f"categorize_expenses failed for {bank.name}")
+
+
+def bench_export(cls, path, args, plot_folder):
+    new_bank = lambda: cls(cls.__name__, path)
+    reference = new_bank()
+    reference.to_standard(categorize=False)
+    standard = reference.df
+    stub = StubClassifier(args.cost_ms)
+
+    cases = {
+        'parse_csv': best_of(new_bank, lambda bank: bank.parse_csv(), args.repeat),
+        'to_standard': best_of(new_bank, lambda bank: bank.to_standard(categorize=False), args.repeat),
+        'categorize_stub': best_of(lambda: standardized_bank(cls, path, standard, stub), categorized, args.repeat),
+        'average_metric_per_month': best_of(lambda: standardized_bank(cls, path, standard),
+                                            lambda bank: bank.average_metric_per_month(), args.repeat),
+    }
+    if args.real:
+        sample = standard.iloc[:args.real_rows]
+        cases['categorize_real'] = best_of(lambda: standardized_bank(cls, path, sample), categorized, args.repeat)
+
+    plotted = standardized_bank(cls, path, standard, stub)
+    categorized(plotted)
+    monthly = plotted.average_metric_per_month()
+    cases['plot_balances'] = best_of(lambda: [plotted], lambda banks: plot_balances(banks, plot_folder), args.repeat)
+    cases['plot_income_vs_expenses'] = best_of(lambda: monthly, lambda df: plot_income_vs_expenses(df, plot_folder),
+                                               args.repeat)
+    cases['plot_expense_categories'] = best_of(lambda: [plotted],
+                                               lambda banks: plot_expense_categories(banks, plot_folder), args.repeat)
+    return cases
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        baseline = pd.DataFrame(json.load(f)['results'])
+    merged = pd.DataFrame(results).merge(baseline, on=KEY, suffixes=('', '_baseline'))
+    merged['ratio'] = merged['seconds'] / merged['seconds_baseline']
+    merged['status'] = merged['ratio'].map(lambda r: 'REGRESSION' if r > tolerance else '')
+    print(tabulate(merged[KEY + ['seconds_baseline', 'seconds', 'ratio', 'status']], headers='keys',
+                   tablefmt='psql', showindex=False, floatfmt='.3f'))
+    return (merged['status'] == 'REGRESSION').any()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[50, 5000],
+                        help='distinct descriptions per export')
+    parser.add_argument('--banks', nargs='+', default=list(BANKS), choices=list(BANKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cost-ms', type=float, default=0.0, help='stub classifier cost per description')
+    parser.add_argument('--real', action='store_true', help='also time the real zero-shot pipeline')
+    parser.add_argument('--real-rows', type=int, default=500, help='rows sent to the real model')
+    parser.add_argument('--label', default=datetime.now().strftime('%Y%m%d-%H%M%S'))
+    parser.add_argument('--compare', metavar='RESULTS_JSON', help='earlier results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.2, help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.banks:
+            for rows in args.rows:
+                for cardinality in args.cardinality:
+                    path = os.path.join(tmp, f"{name}_{rows}_{cardinality}.csv")
+                    write_export(name, path, rows, seed=args.seed, cardinality=cardinality)
+                    for case, seconds in bench_export(BANKS[name], path, args, tmp).items():
+                        case_rows = min(rows, args.real_rows) if case == 'categorize_real' else rows
+                        results.append({'bank': name, 'rows': rows, 'cardinality': cardinality, 'case': case,
+                                        'seconds': seconds, 'rows_per_s': case_rows / seconds if seconds else None})
+
+    print(tabulate(pd.DataFrame(results), headers='keys', tablefmt='psql', showindex=False, floatfmt='.3f'))
+
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+    path = os.path.join(RESULTS_FOLDER, f"{args.label}.json")
+    with open(path, 'w') as f:
+        json.dump({
+            'label': args.label,
+            'git_revision': git_revision(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'args': vars(args),
+            'results': results,
+        }, f, indent=2)
+    print(f"Results written to {path}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
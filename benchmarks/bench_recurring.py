@@ -0,0 +1,35 @@
+# benchmarks/bench_recurring.py
+#
+# Recurring-charge detection time as the number of rows grows. The synthetic
+# frames have no periodic charges, so every candidate series is examined and
+# rejected; rows per second should stay roughly flat.
+#
+#   python -m benchmarks.bench_recurring [--rows 100000 1000000 5000000] [--cardinality 50000]
+
+import argparse
+import time
+
+from tabulate import tabulate
+
+from benchmarks.synthetic import synthetic_transactions
+from src.recurring import detect_recurring
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--cardinality', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rows = []
+    for n in args.rows:
+        df = synthetic_transactions(n, cardinality=args.cardinality)
+        start = time.perf_counter()
+        charges, _ = detect_recurring(df)
+        elapsed = time.perf_counter() - start
+        rows.append([n, f"{elapsed:.3f}", f"{n / elapsed:,.0f}", len(charges)])
+    print(tabulate(rows, headers=['Rows', 'Time (s)', 'Rows/s', 'Charges'], tablefmt='psql'))
+
+
+if __name__ == "__main__":
+    main()
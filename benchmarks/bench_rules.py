@@ -0,0 +1,82 @@
+# benchmarks/bench_rules.py
+#
+# Share of rows decided by the rule tier and wall-clock time saved against
+# sending every distinct description to the classifier. By default the model
+# is replaced by a stub that costs --cost-ms per description; pass --real to
+# use the zero-shot pipeline.
+#
+#   python -m benchmarks.bench_rules [--rows 5000] [--real]
+
+import argparse
+import random
+import time
+
+import pandas as pd
+from tabulate import tabulate
+
+from src.base_bank import BaseBank
+from src.rules import DEFAULT_RULES_PATH, get_rule_categorizer
+
+DESCRIPTIONS = [
+    "BIZUM DE {name} CONCEPTO cena", "TRANSFERENCIA A {name}", "RECIBO {name} S.A.",
+    "Supermercado Mercadona {n}", "LIDL {n} MADRID", "NETFLIX.COM", "Spotify P{n}",
+    "RENFE VIAJEROS {n}", "Farmacia {name}", "Pasteleria La {n}", "Restaurante {name}",
+    "Libreria {name}", "Peluqueria {name}", "Cine {name} {n}",
+]
+NAMES = ["PEPE", "MARIA", "LUIS", "ANA", "CARMEN", "JAVIER", "LUCIA", "PABLO"]
+
+
+class BenchBank(BaseBank):
+    def parse_csv(self):
+        pass
+
+
+class StubClassifier:
+    def __init__(self, cost_ms):
+        self.cost_ms = cost_ms
+
+    def __call__(self, descriptions, candidate_labels):
+        time.sleep(self.cost_ms * len(descriptions) / 1000)
+        return [{'labels': [candidate_labels[-1]]} for _ in descriptions]
+
+
+def synthetic_descriptions(rows, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice(DESCRIPTIONS).format(name=rng.choice(NAMES), n=rng.randint(1, 40)) for _ in range(rows)]
+
+
+def run(descriptions, use_rules, args):
+    bank = BenchBank("Bench", "bench.csv")
+    if not args.real:
+        bank.classifier = StubClassifier(args.cost_ms)
+    if use_rules:
+        bank.categorizers.append(get_rule_categorizer(DEFAULT_RULES_PATH))
+    bank.df = pd.DataFrame({'Description': descriptions})
+
+    start = time.perf_counter()
+    bank.categorize_expenses()
+    elapsed = time.perf_counter() - start
+    rule_share = (bank.df['Category_Source'] == 'rules').mean()
+    return elapsed, rule_share
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--cost-ms', type=float, default=5.0, help='stub classifier cost per description')
+    parser.add_argument('--real', action='store_true', help='use the real zero-shot pipeline')
+    args = parser.parse_args()
+
+    descriptions = synthetic_descriptions(args.rows)
+    model_only, _ = run(descriptions, False, args)
+    tiered, rule_share = run(descriptions, True, args)
+
+    print(tabulate([
+        ["Model only", f"{model_only:.3f}", "0.0%"],
+        ["Rules + model", f"{tiered:.3f}", f"{rule_share:.1%}"],
+    ], headers=['Mode', 'Time (s)', 'Rows decided by rules'], tablefmt='psql'))
+    print(f"Saved {model_only - tiered:.3f}s ({1 - tiered / model_only:.1%})")
+
+
+if __name__ == "__main__":
+    main()
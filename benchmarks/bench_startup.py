@@ -0,0 +1,56 @@
+# benchmarks/bench_startup.py
+#
+# Startup time and peak memory of building N banks, each measured in a fresh
+# interpreter so that RSS is not shared between runs.
+#
+#   python -m benchmarks.bench_startup [--categorize]
+
+import argparse
+import json
+import subprocess
+import sys
+
+from tabulate import tabulate
+
+BANK_COUNTS = [1, 5, 20]
+
+_CHILD = """
+import json, resource, time
+import pandas as pd
+start = time.perf_counter()
+from src.bank_factory import BankFactory
+banks = [BankFactory.get_bank('Openbank', 'data/openbank_test.csv') for _ in range({n})]
+built = time.perf_counter() - start
+if {categorize}:
+    for bank in banks:
+        bank.df = pd.DataFrame({{'Description': ['Supermercado Mercadona']}})
+        bank.categorize_expenses()
+total = time.perf_counter() - start
+print(json.dumps({{
+    'build_s': built,
+    'total_s': total,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def run(n, categorize):
+    code = _CHILD.format(n=n, categorize=categorize)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--categorize', action='store_true', help='also categorize one row per bank')
+    args = parser.parse_args()
+
+    rows = []
+    for n in BANK_COUNTS:
+        result = run(n, args.categorize)
+        rows.append([n, f"{result['build_s']:.3f}", f"{result['total_s']:.3f}", f"{result['peak_rss_mb']:.1f}"])
+    print(tabulate(rows, headers=['Banks', 'Build (s)', 'Total (s)', 'Peak RSS (MB)'], tablefmt='psql'))
+
+
+if __name__ == "__main__":
+    main()
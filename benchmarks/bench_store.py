@@ -0,0 +1,61 @@
+# benchmarks/bench_store.py
+#
+# File size and load time of the Parquet store against the CSV that
+# BaseBank.save_data writes for the same standardized transactions.
+#
+#   python -m benchmarks.bench_store [--rows 1000000]
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from tabulate import tabulate
+
+from benchmarks.synthetic import synthetic_transactions
+from src.store import read_transactions, write_transactions
+
+
+def folder_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_transactions(args.rows)
+    df['Category'] = df['Description'].map(lambda d: 'Groceries' if 'Mercadona' in d else 'Other')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'Synthetic_metrics.csv')
+        df.to_csv(csv_path, index=False)
+        write_transactions(df, tmp, 'Synthetic')
+        parquet_path = os.path.join(tmp, 'transactions')
+
+        rows = [
+            ["CSV, full", folder_size(csv_path) / 2**20,
+             timed(lambda: pd.read_csv(csv_path, parse_dates=['Date']))],
+            ["Parquet, full", folder_size(parquet_path) / 2**20,
+             timed(lambda: read_transactions(tmp))],
+            ["Parquet, 3 months", None,
+             timed(lambda: read_transactions(tmp, start_date='2024-06-01', end_date='2024-08-31'))],
+            ["Parquet, 3 months, 2 columns", None,
+             timed(lambda: read_transactions(tmp, start_date='2024-06-01', end_date='2024-08-31',
+                                             columns=['Amount', 'Category']))],
+        ]
+    print(tabulate(rows, headers=['Read', 'Size (MB)', 'Load (s)'], tablefmt='psql', floatfmt='.3f'))
+
+
+if __name__ == "__main__":
+    main()
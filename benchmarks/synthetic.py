@@ -0,0 +1,144 @@
+# benchmarks/synthetic.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+MERCHANTS = [
+    "Supermercado Mercadona", "LIDL MADRID", "BIZUM DE PEPE", "TRANSFERENCIA A MARIA", "NETFLIX.COM",
+    "RENFE VIAJEROS", "Farmacia Lopez", "Pasteleria La 28", "RECIBO IBERDROLA", "Amazon EU",
+]
+
+OPENBANK_PREAMBLE = [
+    ";;;;;;;;;",
+    ";Cuentas - Movimientos;;;;;;;;",
+    ";;;;;;;;;Fecha de descarga: 28/12/2023 23:53h",
+    ";Número de Cuenta: ;;00;;;;;;",
+    ";;;;;;;;;",
+    ";Descripción:;;CUENTA NÓMINA OPEN ;;;;;;",
+    ";Titular:;;Synthetic;;;;;;",
+    ";Saldo:;;{balance} EUR;;;;;;",
+    ";Lista de Movimientos;;;;;;;;",
+    ";;;;;;;;;",
+    ";Fecha Operación;;Fecha Valor;;Concepto;;Importe;;Saldo",
+]
+
+REVOLUT_COLUMNS = ["Type", "Product", "Started Date", "Completed Date", "Description",
+                   "Amount", "Fee", "Currency", "State", "Balance"]
+
+
+def merchant_pool(cardinality=None):
+    # `cardinality` distinct descriptions; None keeps the plain merchant list
+    if cardinality is None:
+        return MERCHANTS
+    return [MERCHANTS[i % len(MERCHANTS)] + (f" {i // len(MERCHANTS)}" if i >= len(MERCHANTS) else "")
+            for i in range(cardinality)]
+
+
+def synthetic_transactions(rows, bank='Synthetic', start='2020-01-01', end='2024-12-31', seed=0, cardinality=None):
+    # A standardized (post to_standard) transaction frame with a consistent running balance
+    rng = np.random.default_rng(seed)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    offsets = np.sort(rng.integers(0, int((end - start).total_seconds()), rows))
+    dates = start + pd.to_timedelta(offsets, unit='s')
+    amounts = np.round(np.where(rng.random(rows) < 0.2, rng.gamma(2.0, 400.0, rows), -rng.gamma(1.5, 30.0, rows)), 2)
+    df = pd.DataFrame({
+        'Date': dates,
+        'Amount': amounts,
+        'Balance': np.round(1000 + np.cumsum(amounts), 2),
+        'Description': rng.choice(merchant_pool(cardinality), rows),
+        'Bank': bank,
+    })
+    df['YearMonth'] = df['Date'].dt.to_period('M')
+    return df
+
+
+def spanish_numbers(values):
+    # 1766.92 -> "1.766,92"
+    return pd.Series([f"{v:,.2f}" for v in values]).str.translate(str.maketrans({',': '.', '.': ','}))
+
+
+def write_openbank_csv(path, rows, start='2020-01-01', end='2024-12-31', seed=0, cardinality=None):
+    # Openbank export: BOM, 10 preamble lines, every field preceded by an empty
+    # `;` column, Spanish decimals, newest movement first, a blank trailer line.
+    # Openbank only has day precision, so dates are truncated.
+    df = synthetic_transactions(rows, 'Openbank', start, end, seed, cardinality).iloc[::-1]
+    dates = df['Date'].dt.strftime('%d/%m/%Y')
+    amounts = spanish_numbers(df['Amount']).to_numpy()
+    balances = spanish_numbers(df['Balance']).to_numpy()
+    balance = balances[0] if rows else "0,00"
+    lines = [line.format(balance=balance) for line in OPENBANK_PREAMBLE]
+    lines += [f";{d};;{d};;{desc} ;;{a};;{b}"
+              for d, desc, a, b in zip(dates, df['Description'], amounts, balances)]
+    lines.append(";;;;;;;;;")
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write("\n".join(lines) + "\n")
+    return df
+
+
+def write_revolut_csv(path, rows, start='2020-01-01', end='2024-12-31', seed=0, cardinality=None):
+    # Revolut export: comma separated, oldest first, space-padded fields
+    df = synthetic_transactions(rows, 'Revolut', start, end, seed, cardinality)
+    rng = np.random.default_rng(seed + 1)
+    income = df['Amount'] > 0
+    completed = df['Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    started = (df['Date'] - pd.to_timedelta(rng.integers(0, 86_400, rows), unit='s')).dt.strftime('%Y-%m-%d %H:%M:%S')
+    export = pd.DataFrame({
+        'Type': np.where(income, 'TOPUP', 'CARD_PAYMENT'),
+        'Product': 'Current',
+        'Started Date': started,
+        'Completed Date': completed,
+        'Description': df['Description'],
+        'Amount': df['Amount'].map('{:.2f}'.format),
+        'Fee': '0.00',
+        'Currency': 'EUR',
+        'State': 'COMPLETED',
+        'Balance': df['Balance'].map('{:.2f}'.format),
+    }, columns=REVOLUT_COLUMNS)
+    export.columns = [f"{col} " for col in REVOLUT_COLUMNS]
+    export.to_csv(path, index=False)
+    return df
+
+
+EXPORT_WRITERS = {'Openbank': write_openbank_csv, 'Revolut': write_revolut_csv}
+
+
+def write_export(bank, path, rows, **kwargs):
+    return EXPORT_WRITERS[bank](path, rows, **kwargs)
+
+
+# Architectures of the default models, for random-weight stand-ins built without the Hugging Face hub
+MODEL_SHAPES = {
+    'nli': ('distilbert', dict(dim=768, n_layers=6, n_heads=12, hidden_dim=3072)),
+    'embedding': ('bert', dict(hidden_size=384, num_hidden_layers=6, num_attention_heads=12, intermediate_size=1536)),
+}
+NLI_LABELS = {0: 'entailment', 1: 'neutral', 2: 'contradiction'}
+
+
+def write_random_model(path, kind, texts, seed=0, **shape):
+    # Untrained model with the default model's architecture (or `shape` overrides) and a word-level
+    # vocabulary covering `texts`. Its labels are noise; its cost per forward pass is the real one.
+    import re
+    import torch
+    from transformers import AutoConfig, AutoModel, AutoModelForSequenceClassification, BertTokenizer
+
+    model_type, default_shape = MODEL_SHAPES[kind]
+    words = sorted({word for text in texts for word in re.findall(r'\w+|[^\w\s]', str(text).lower())})
+    os.makedirs(path, exist_ok=True)
+    vocab_path = os.path.join(path, 'vocab.txt')
+    with open(vocab_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]', *words]) + '\n')
+
+    config = AutoConfig.for_model(model_type, vocab_size=len(words) + 5, **{**default_shape, **shape})
+    torch.manual_seed(seed)
+    if kind == 'nli':
+        config.id2label = NLI_LABELS
+        config.label2id = {label: i for i, label in NLI_LABELS.items()}
+        model = AutoModelForSequenceClassification.from_config(config)
+    else:
+        model = AutoModel.from_config(config)
+    model.save_pretrained(path)
+    inputs = ['input_ids', 'attention_mask'] if model_type == 'distilbert' else ['input_ids', 'token_type_ids', 'attention_mask']
+    BertTokenizer(vocab_path, do_lower_case=True, model_max_length=512, model_input_names=inputs).save_pretrained(path)
+    return path
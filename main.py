@@ -1,21 +1,134 @@
+import argparse
+import asyncio
+import cProfile
+import multiprocessing
+import os
 import pandas as pd
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tabulate import tabulate
 
 from src.bank_factory import BankFactory
-from src.plotting import plot_balances, plot_income_vs_expenses, plot_expense_categories
+from src.classifier import BACKENDS, DEFAULT_MODELS
+from src.cube import RollupCube
+from src.financial_functions import filter_date_range
+from src.incremental import incremental_update, load_cube, save_cube
+from src.ingestion import categorize_standardized, standardize_file
+from src.metrics import PERIOD_COLUMNS, clip_periods, periods_between
+from src.pipeline import BackgroundWriter, run_stages
+from src.plotting import render_plots
+from src.profiling import Profiler, get_profiler, set_profiler
+from src.recurring import RecurringCategorizer
+from src.rules import DEFAULT_RULES_PATH, get_rule_categorizer
+from src.schema import combine_transactions
+from src.store import load_banks_from_store, write_metrics, write_transactions
 
-def load_banks(bank_files):
-    return [BankFactory.get_bank(bank_file['bank_name'], bank_file['csv_path']) for bank_file in bank_files]
+CATEGORY_CACHE_PATH = 'cache/categories.json'
+STATE_FOLDER = 'state/'
+STORE_FOLDER = 'store/'
+RESULTS_FOLDER = 'results/'
+START_DATE = "2024-06-01 12:00:00"
+END_DATE = "2024-08-21 12:00:00"
 
-def calculate_totals(banks):
+def load_banks(bank_files, cache_path=None, rules_path=None, backend='pytorch', threads=None):
+    banks = [BankFactory.get_bank(bank_file['bank_name'], bank_file['csv_path']) for bank_file in bank_files]
+    for bank in banks:
+        bank.cache_path = cache_path
+        bank.model_name = DEFAULT_MODELS[backend]
+        bank.backend = backend
+        bank.threads = threads
+        if rules_path:
+            bank.categorizers.append(get_rule_categorizer(rules_path))
+    return banks
+
+def calculate_totals(banks, workers=1, state_folder=None, store_folder=None, cube=None, categorize=True,
+                     queue_size=1, recurring=False):
+    return asyncio.run(_calculate_totals(banks, workers, state_folder, store_folder, cube, categorize, queue_size,
+                                         recurring))
+
+def detect_recurring_charges(banks):
+    # Recurring charges are found across every account at once and become a categorizer tier
+    # (after the rules, see RecurringCategorizer), so the rows they cover never reach the model.
+    # Running detection again replaces the tier of the previous detection.
+    frames = [bank.df[['Date', 'Amount', 'Description', 'Bank']] for bank in banks if bank.df is not None]
+    if not frames:
+        return None
+    with get_profiler().stage(None, 'detect_recurring', rows=sum(len(df) for df in frames)):
+        detector = RecurringCategorizer.from_transactions(combine_transactions(frames))
+    for bank in banks:
+        bank.categorizers = [c for c in bank.categorizers if not isinstance(c, RecurringCategorizer)] + [detector]
+    return detector
+
+async def _calculate_totals(banks, workers, state_folder, store_folder, cube, categorize, queue_size, recurring):
+    # Banks flow through three overlapping stages joined by bounded queues:
+    #   parse      - worker processes (a thread with workers=1) parse and standardize bank N+1 ...
+    #   categorize - ... while one model thread categorizes bank N (incremental runs do both here) ...
+    #   report     - ... and this loop prints bank N-1's table, in bank order.
+    # Result CSVs and Parquet files are written in the background by an I/O thread.
+    # Recurring-charge detection needs every account, so with recurring=True all banks are
+    # parsed before the first one is categorized.
     total_spent = total_income = total_beginning_balance = total_ending_balance = 0
     combined_metrics = []
+    profiler = get_profiler()
+    loop = asyncio.get_running_loop()
 
-    for bank in banks:
-        bank.to_standard()
+    def write_store(bank, df):
+        with profiler.stage(bank.name, 'write_store', rows=len(df)):
+            write_transactions(df, store_folder, bank.name)
+
+    def write_charges(charges):
+        os.makedirs(RESULTS_FOLDER, exist_ok=True)
+        charges.to_csv(f'{RESULTS_FOLDER}recurring_charges.csv', index=False)
+
+    def update(bank):
+        with profiler.stage(bank.name, 'incremental_update'):
+            return incremental_update(bank, state_folder, categorize=categorize, cube=cube,
+                                      start_date=START_DATE, end_date=END_DATE)
+
+    async def parse(bank):
+        # Banks already loaded (e.g. from the columnar store) are not parsed again
+        if bank.df is None and not state_folder:
+            if workers > 1:
+                bank.df, stages = await loop.run_in_executor(parse_pool, standardize_file, type(bank), bank.name,
+                                                             bank.csv_path, profiler.enabled)
+                profiler.extend(stages)
+            else:
+                await loop.run_in_executor(parse_pool, bank.to_standard, False)
+        return bank, None
+
+    async def categorize_bank(item):
+        bank, _ = item
+        if state_folder:
+            return bank, await loop.run_in_executor(model_thread, update, bank)
+        if categorize and bank.df is not None and 'Category' not in bank.df.columns:
+            await loop.run_in_executor(model_thread, categorize_standardized, bank)
+        return bank, None
+
+    async def report(item):
+        nonlocal total_spent, total_income, total_beginning_balance, total_ending_balance
+        bank, history = item
+        if bank.df is None or bank.df.empty:
+            print(f"\nSkipping {bank.name}: no transactions could be loaded")
+            return item
+        if store_folder:
+            await writer.submit(write_store, bank, bank.df)
         print(f"\n{'-'*40}\nProcessing Bank: {bank.name}\n{'-'*40}")
-        df_monthly = bank.calculate_metrics(start_date="2024-06-01 12:00:00", end_date="2024-08-21 12:00:00")
+        with profiler.stage(bank.name, 'calculate_metrics', rows=len(bank.df)):
+            if state_folder:
+                # Stored aggregates cover whole months; the months cut by the window are recomputed.
+                # incremental_update already brought the cube up to date.
+                df_monthly = clip_periods(history, bank.df, START_DATE, END_DATE)
+                bank.df = filter_date_range(bank.df, START_DATE, END_DATE)
+            else:
+                bank.df = filter_date_range(bank.df, START_DATE, END_DATE)
+                if cube is not None:
+                    cube.add_bank(bank.name, bank.df)
+                    df_monthly = cube.metrics(bank.name)
+                else:
+                    df_monthly = bank.average_metric_per_month()
+        if df_monthly.empty:
+            print(f"No transactions between {START_DATE} and {END_DATE}")
+            return item
         print(tabulate(df_monthly, headers='keys', tablefmt='psql'))
 
         total_spent += df_monthly['Total_Expense'].sum()
@@ -23,11 +136,67 @@ def calculate_totals(banks):
         total_beginning_balance += df_monthly['Balance_Beginning'].iloc[0]
         total_ending_balance += df_monthly['Balance_Ending'].iloc[-1]
 
-        bank.save_data(bank.df, f"{bank.name}_metrics", 'results/')
+        await writer.submit(bank.save_data, bank.df, f"{bank.name}_metrics", RESULTS_FOLDER)
+        if store_folder:
+            await writer.submit(write_metrics, df_monthly, store_folder, bank.name)
         combined_metrics.append(df_monthly)
+        return item
+
+    # The pool's workers start lazily, after the model and I/O threads are already running;
+    # forking a process with live threads can deadlock the child, so workers are spawned
+    parse_pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) if workers > 1 \
+        else ThreadPoolExecutor(1)
+    with parse_pool, ThreadPoolExecutor(1) as model_thread, ThreadPoolExecutor(1) as io_thread:
+        writer = BackgroundWriter(io_thread)
+        try:
+            if recurring:
+                parsed = await asyncio.gather(*(parse(bank) for bank in banks))
+                detector = await loop.run_in_executor(model_thread, detect_recurring_charges, banks)
+                if detector is not None:
+                    print(f"\n{'-'*40}\nRecurring Charges\n{'-'*40}")
+                    print(tabulate(detector.charges, headers='keys', tablefmt='psql', showindex=False))
+                    await writer.submit(write_charges, detector.charges)
+                await run_stages(parsed, [categorize_bank, report], queue_size)
+            else:
+                await run_stages(banks, [parse, categorize_bank, report], queue_size)
+        finally:
+            await writer.drain()
+
+    return total_income, total_spent, total_beginning_balance, total_ending_balance, combined_metrics
+
+def stream_totals(banks, chunksize=100_000):
+    # Metrics-only pass: each export is read and aggregated chunk by chunk, so no bank.df is
+    # ever built. Nothing is categorized, stored or plotted. Same return value as calculate_totals.
+    total_spent = total_income = total_beginning_balance = total_ending_balance = 0
+    combined_metrics = []
+    profiler = get_profiler()
+    for bank in banks:
+        try:
+            with profiler.stage(bank.name, 'stream_metrics'):
+                df_monthly = bank.stream_metrics(START_DATE, END_DATE, chunksize=chunksize)
+        except Exception as e:
+            print(f"Error processing {bank.name}: {e}")
+            df_monthly = None
+        if df_monthly is None or df_monthly.empty:
+            print(f"\nSkipping {bank.name}: no transactions could be loaded")
+            continue
+        print(f"\n{'-'*40}\nProcessing Bank: {bank.name}\n{'-'*40}")
+        print(tabulate(df_monthly, headers='keys', tablefmt='psql'))
 
+        total_spent += df_monthly['Total_Expense'].sum()
+        total_income += df_monthly['Total_Income'].sum()
+        total_beginning_balance += df_monthly['Balance_Beginning'].iloc[0]
+        total_ending_balance += df_monthly['Balance_Ending'].iloc[-1]
+        combined_metrics.append(df_monthly)
     return total_income, total_spent, total_beginning_balance, total_ending_balance, combined_metrics
 
+def combine_metrics(combined_metrics, freq='M'):
+    # Per-bank metrics summed per period, as RollupCube.metrics() does for the banks it holds
+    period_column = PERIOD_COLUMNS[freq]
+    if not combined_metrics:
+        return pd.DataFrame(columns=[period_column, 'Total_Income', 'Total_Expense', 'Balance_Beginning', 'Balance_Ending'])
+    return pd.concat(combined_metrics).groupby(period_column).sum().reset_index()
+
 def compute_summary_stats(total_income, total_spent, overall_balance_change, savings_rate):
     summary_stats = pd.DataFrame({
         "Metric": ["Total Income", "Total Expense", "Overall Balance Change", "Savings Rate (Average)"],
@@ -35,34 +204,123 @@ def compute_summary_stats(total_income, total_spent, overall_balance_change, sav
     })
     return summary_stats
 
-def main():
+def run_pipeline(workers=1, incremental=False, store=False, from_store=False, backend='pytorch', threads=None,
+                 categorize=True, plots=True, recurring=False, stream=False):
     bank_files = [
         {"csv_path": "data/openbank_junio-agosto.csv", "bank_name": "Openbank"},
         {"csv_path": "data/revolut_junio-agosto.csv", "bank_name": "Revolut"}
     ]
 
-    banks = load_banks(bank_files)
-    total_income, total_spent, total_beginning_balance, total_ending_balance, combined_metrics = calculate_totals(banks)
+    banks = load_banks(bank_files, cache_path=CATEGORY_CACHE_PATH, rules_path=DEFAULT_RULES_PATH,
+                       backend=backend, threads=threads)
+    if stream:
+        totals = stream_totals(banks)
+        combined_metrics_df = periods_between(combine_metrics(totals[4]), START_DATE, END_DATE)
+        summarize(banks, totals, combined_metrics_df, workers, None, plots=False)
+        return
+    if from_store:
+        load_banks_from_store(banks, STORE_FOLDER, START_DATE, END_DATE)
+    # Incremental runs pick up the cube saved by the previous run and only recompute the days that changed
+    cube = load_cube(STATE_FOLDER, START_DATE, END_DATE) if incremental else RollupCube()
+    totals = calculate_totals(
+        banks, workers, STATE_FOLDER if incremental else None, STORE_FOLDER if store and not from_store else None, cube,
+        categorize, recurring=recurring)
+    if incremental:
+        loaded = {bank.name for bank in banks if bank.df is not None}
+        for name in cube.banks:
+            if name not in loaded:
+                cube.remove_bank(name)
+        save_cube(cube, STATE_FOLDER, START_DATE, END_DATE)
 
+    combined_metrics_df = periods_between(cube.metrics(), START_DATE, END_DATE)
+    summarize(banks, totals, combined_metrics_df, workers, cube, plots)
+
+def summarize(banks, totals, combined_metrics_df, workers=1, cube=None, plots=True):
+    total_income, total_spent, total_beginning_balance, total_ending_balance, _ = totals
     overall_balance_change = total_ending_balance - total_beginning_balance
 
-    combined_metrics_df = pd.concat(combined_metrics).groupby('YearMonth').sum().reset_index()
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
     combined_metrics_df['Savings_Rate'] = (combined_metrics_df['Total_Income'] - combined_metrics_df['Total_Expense']) / combined_metrics_df['Total_Income']
-    combined_metrics_df.to_csv('results/combined_metrics.csv', index=False)
+    combined_metrics_df.to_csv(f'{RESULTS_FOLDER}combined_metrics.csv', index=False)
+
+    # The figures only need data that is final by now, so they render while the summary is printed
+    with ThreadPoolExecutor(1) as plot_thread:
+        plotted = plot_thread.submit(plot_results, banks, combined_metrics_df, workers, cube) if plots else None
+
+        print(f"\n{'='*40}\nCombined Monthly Metrics\n{'='*40}")
+        print(tabulate(combined_metrics_df, headers='keys', tablefmt='psql'))
+
+        summary_stats = compute_summary_stats(total_income, total_spent, overall_balance_change, combined_metrics_df['Savings_Rate'].mean())
+
+        print(f"\n{'='*40}\nSummary Statistics\n{'='*40}")
+        print(tabulate(summary_stats, headers='keys', tablefmt='psql'))
+
+        summary_stats.to_csv(f'{RESULTS_FOLDER}summary_statistics.csv', index=False)
 
-    print(f"\n{'='*40}\nCombined Monthly Metrics\n{'='*40}")
-    print(tabulate(combined_metrics_df, headers='keys', tablefmt='psql'))
+        if plotted is not None:
+            plotted.result()
 
-    summary_stats = compute_summary_stats(total_income, total_spent, overall_balance_change, combined_metrics_df['Savings_Rate'].mean())
-    
-    print(f"\n{'='*40}\nSummary Statistics\n{'='*40}")
-    print(tabulate(summary_stats, headers='keys', tablefmt='psql'))
+def plot_results(banks, combined_metrics_df, workers=1, cube=None):
+    with get_profiler().stage(None, 'plots'):
+        return render_plots(banks, combined_metrics_df, RESULTS_FOLDER, workers, cube)
 
-    summary_stats.to_csv('results/summary_statistics.csv', index=False)
+def main(workers=1, incremental=False, store=False, from_store=False, profile=False, cprofile_path=None,
+         backend='pytorch', threads=None, categorize=True, plots=True, recurring=False, stream=False):
+    # profile=True writes per-stage timings to results/profile.{json,csv}; cprofile_path dumps cProfile stats
+    profiler = set_profiler(Profiler() if profile else None)
+    cprofiler = cProfile.Profile() if cprofile_path else None
+    try:
+        if cprofiler is not None:
+            cprofiler.runcall(run_pipeline, workers, incremental, store, from_store, backend, threads,
+                              categorize, plots, recurring, stream)
+        else:
+            run_pipeline(workers, incremental, store, from_store, backend, threads, categorize, plots, recurring, stream)
+    finally:
+        if cprofiler is not None:
+            cprofiler.dump_stats(cprofile_path)
+        if profile:
+            profiler.write_report(RESULTS_FOLDER)
+            print(f"\nProfile written to {RESULTS_FOLDER}profile.json")
+        set_profiler(None)
 
-    plot_balances(banks, 'results/')
-    plot_income_vs_expenses(combined_metrics_df, 'results/')
-    plot_expense_categories(banks, 'results/')
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summarize personal finances across bank exports.")
+    parser.add_argument('--workers', type=int, default=1, help="processes used to parse bank files (default: 1)")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"only categorize and aggregate rows that are new since the last run (state kept in {STATE_FOLDER})")
+    parser.add_argument('--store', action='store_true',
+                        help=f"also write standardized transactions and metrics as Parquet under {STORE_FOLDER}")
+    parser.add_argument('--from-store', action='store_true',
+                        help=f"load standardized transactions from {STORE_FOLDER} instead of parsing the bank exports")
+    parser.add_argument('--backend', choices=BACKENDS, default='pytorch',
+                        help="classifier inference backend; only pytorch has been checked against labeled data, "
+                             "the others are experimental until their accuracy is recorded in benchmarks/bench_backends.py")
+    parser.add_argument('--threads', type=int, help="intra-op threads for the classifier backend")
+    parser.add_argument('--no-categorize', dest='categorize', action='store_false',
+                        help="skip expense categorization; the classifier (and torch) is never imported")
+    parser.add_argument('--no-plots', dest='plots', action='store_false',
+                        help="skip rendering plots; matplotlib and seaborn are never imported")
+    parser.add_argument('--recurring', action='store_true',
+                        help=f"detect recurring charges across all accounts, write {RESULTS_FOLDER}recurring_charges.csv "
+                             "and label them Subscriptions/Rent without the model")
+    parser.add_argument('--stream', action='store_true',
+                        help="metrics only: read each export in chunks without loading it whole; "
+                             "no categorization, store or plots")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"record per-stage timings and memory to {RESULTS_FOLDER}profile.json/.csv")
+    parser.add_argument('--cprofile', metavar='PATH', help="also dump cProfile stats to PATH")
+    args = parser.parse_args()
+    if args.recurring and args.incremental:
+        parser.error("--recurring needs every account parsed up front and cannot be combined with --incremental")
+    if args.from_store and args.incremental:
+        parser.error("--incremental re-reads the bank exports and cannot be combined with --from-store")
+    if args.stream and (args.incremental or args.store or args.from_store or args.recurring):
+        parser.error("--stream never builds the transaction tables that --incremental, --store, --from-store "
+                     "and --recurring work on")
+    return args
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(workers=args.workers, incremental=args.incremental, store=args.store, from_store=args.from_store,
+         profile=args.profile, cprofile_path=args.cprofile, backend=args.backend, threads=args.threads,
+         categorize=args.categorize, plots=args.plots, recurring=args.recurring, stream=args.stream)
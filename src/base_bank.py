@@ -1,17 +1,35 @@
 import os
+import time
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
-from transformers import pipeline
+from src.category_cache import get_category_cache, normalize_descriptions
+from src.classifier import DEFAULT_MODEL, classifier_id, get_classifier
 from src.financial_functions import filter_date_range
+from src.metrics import period_metrics, streaming_period_metrics
+from src.profiling import get_profiler
+from src.query import TransactionIndex, frame_version
+from src.schema import compact_transactions
 
 class BaseBank(ABC):
+    # Whether iter_csv_chunks yields later movements before earlier ones (rows inside a
+    # chunk are always chronological)
+    chunks_newest_first = False
+
     def __init__(self, name, csv_path):
         self.df = None
         self.name = name
         self.csv_path = csv_path
         self.datetime_format = "%d/%m/%Y %H:%M:%S"
         
-        self.classifier = pipeline('zero-shot-classification', model='typeform/distilbert-base-uncased-mnli')
+        self.model_name = DEFAULT_MODEL
+        self.backend = 'pytorch'   # see src.classifier.BACKENDS
+        self.threads = None        # intra-op threads for the classifier backend
+        self._classifier = None
+        self.cache_path = None
+        self.categorizers = []
+        self._index = None
+        self._index_version = None
         
         self.candidate_labels = [
             "Groceries",      # Supermarkets, food shopping
@@ -33,60 +51,164 @@ class BaseBank(ABC):
             "Other"           # Miscellaneous
         ]
 
+    @property
+    def classifier(self):
+        # Resolved lazily from the shared pool so building a bank never loads the model
+        if self._classifier is None:
+            return get_classifier(self.model_name, self.backend, self.threads)
+        return self._classifier
+
+    @classifier.setter
+    def classifier(self, classifier):
+        self._classifier = classifier
+
     @abstractmethod
     def parse_csv(self):
         pass
 
-    def calculate_metrics(self, start_date=None, end_date=None):
-        self.df = filter_date_range(self.df, start_date, end_date)
-        return self.average_metric_per_month()
-
-    def average_metric_per_month(self):
-        self.df['Income'] = self.df['Amount'].apply(lambda x: x if x > 0 else 0)
-        self.df['Expense'] = self.df['Amount'].apply(lambda x: x if x < 0 else 0)
-        metrics_per_month = self.df.groupby('YearMonth').agg({
-            'Income': 'sum',
-            'Expense': 'sum',
-            'Balance': ['first', 'last']
-        }).reset_index()
-        metrics_per_month.columns = ['YearMonth', 'Total_Income', 'Total_Expense', 'Balance_Beginning', 'Balance_Ending']
-        metrics_per_month['Total_Expense'] = metrics_per_month['Total_Expense'].abs()
-        return metrics_per_month
-    
-    def categorize_expenses(self):
-        try:
-            # Process descriptions in batches for faster performance
-            batch_size = 32  # Adjust the batch size depending on your memory constraints
-            descriptions = self.df['Description'].tolist()
-            categories = []
+    def iter_csv_chunks(self, chunksize=100_000):
+        # Banks without a streaming parser parse the whole file and hand it out in slices
+        self.parse_csv()
+        for start in range(0, len(self.df), chunksize):
+            yield self.df.iloc[start:start+chunksize]
 
-            for i in range(0, len(descriptions), batch_size):
-                batch_descriptions = descriptions[i:i+batch_size]
-                results = self.classifier(batch_descriptions, self.candidate_labels)
-                categories.extend([result['labels'][0] for result in results])
+    def iter_standard_chunks(self, chunksize=100_000, start_date=None, end_date=None):
+        for chunk in self.iter_csv_chunks(chunksize):
+            chunk = filter_date_range(chunk.assign(Date=pd.to_datetime(chunk['Date'], errors='coerce')), start_date, end_date)
+            if not chunk.empty:
+                yield chunk.assign(YearMonth=chunk['Date'].dt.to_period('M'))
 
-            self.df['Category'] = categories
+    def stream_metrics(self, start_date=None, end_date=None, freq='M', chunksize=100_000):
+        # calculate_metrics over parsed chunks; with a streaming parser the whole export is never in memory
+        return streaming_period_metrics(self.iter_standard_chunks(chunksize, start_date, end_date), freq,
+                                        self.chunks_newest_first)
 
+    def calculate_metrics(self, start_date=None, end_date=None, freq='M'):
+        with get_profiler().stage(self.name, 'calculate_metrics', rows=len(self.df)):
+            self.df = filter_date_range(self.df, start_date, end_date)
+            return self.average_metric_per_month(freq)
+
+    def average_metric_per_month(self, freq='M'):
+        return period_metrics(self.df, freq)
+
+    def get_category_cache(self):
+        if not self.cache_path:
+            return None
+        return get_category_cache(self.cache_path, classifier_id(self.model_name, self.backend),
+                                  self.candidate_labels)
+
+    def categorize_expenses(self):
+        try:
+            with get_profiler().stage(self.name, 'categorize', rows=len(self.df)):
+                self.df['Category'], self.df['Category_Source'] = self.categorize(self.df['Description'],
+                                                                                  self.df.get('Amount'))
         except Exception as e:
             print(f"Error categorizing expenses for {self.name}: {e}")
 
+    def categorize(self, descriptions, amounts=None):
+        # Returns per-row (categories, sources) arrays for a Series of descriptions.
+        # Each distinct description is classified once and its label scattered back to every row;
+        # with amounts, expenses and income sharing a description are told apart for the tiers.
+        expense = np.zeros(len(descriptions), dtype=bool) if amounts is None else np.asarray(amounts, dtype=float) < 0
+        key_codes, distinct_keys = pd.factorize(normalize_descriptions(descriptions))
+        codes, units = pd.factorize(key_codes * 2 + expense)
+        keys = list(distinct_keys[units // 2])
+        is_expense = (units % 2).astype(bool)
+        _, first_rows = np.unique(codes, return_index=True)
+        representatives = descriptions.astype(str).to_numpy()[first_rows]
+        labels = [None] * len(keys)
+        sources = [None] * len(keys)
+
+        # Cheap deterministic tiers (e.g. rules) decide what they can before the cache and the model.
+        # A tier with expenses_only only sees expense rows, and may relabel what earlier tiers
+        # put in one of its `overrides` categories.
+        for categorizer in self.categorizers:
+            expenses_only = getattr(categorizer, 'expenses_only', False)
+            overrides = getattr(categorizer, 'overrides', ())
+            undecided = [i for i, label in enumerate(labels)
+                         if (label is None or label in overrides) and (is_expense[i] or not expenses_only)]
+            if not undecided:
+                continue
+            for i, label in zip(undecided, categorizer.categorize([keys[i] for i in undecided])):
+                if label is not None:
+                    labels[i] = label
+                    sources[i] = categorizer.name
+
+        # Only descriptions the cache has never seen are sent to the model
+        cache = self.get_category_cache()
+        lookups = 0
+        pending = []
+        for i, key in enumerate(keys):
+            if labels[i] is not None:
+                continue
+            if cache is not None:
+                lookups += 1
+                labels[i] = cache.get(key)
+                sources[i] = 'cache'
+            if labels[i] is None:
+                pending.append(i)
+
+        # An expense and an income row with the same description only cost one model call
+        misses = {}
+        for i in pending:
+            misses.setdefault(keys[i], []).append(i)
+        if misses:
+            results = self.classify_descriptions([representatives[units[0]] for units in misses.values()])
+            for (key, units), label in zip(misses.items(), results):
+                for i in units:
+                    labels[i] = label
+                    sources[i] = 'model'
+                if cache is not None:
+                    cache.put(key, label)
+
+        if cache is not None:
+            cache.save()
+            print(f"Category cache for {self.name}: {lookups - len(pending)} hits, {len(pending)} misses")
+
+        return np.asarray(labels, dtype=object)[codes], np.asarray(sources, dtype=object)[codes]
+
+    def classify_descriptions(self, descriptions, batch_size=32):
+        # Batches of similar length waste less padding; adjust batch_size to your memory constraints
+        order = sorted(range(len(descriptions)), key=lambda i: len(descriptions[i]))
+        labels = [None] * len(descriptions)
+        classifier = self.classifier
+        profiler = get_profiler()
+
+        for start in range(0, len(order), batch_size):
+            batch_rows = order[start:start+batch_size]
+            batch_start = time.perf_counter()
+            results = classifier([descriptions[i] for i in batch_rows], self.candidate_labels)
+            profiler.record_batch(self.name, len(batch_rows), time.perf_counter() - batch_start)
+            for i, result in zip(batch_rows, results):
+                labels[i] = result['labels'][0]
+
+        return labels
+
     def categorize_description(self, description):
         result = self.classifier(description, self.candidate_labels)
         return result['labels'][0]  # Return the category with the highest score
 
     def save_data(self, df, out_name, output_folder="."):
         try:
-            os.makedirs(output_folder, exist_ok=True)
-            df.to_csv(f"{output_folder}/{out_name}.csv", index=False)
+            with get_profiler().stage(self.name, 'save_data', rows=len(df)):
+                os.makedirs(output_folder, exist_ok=True)
+                df.to_csv(f"{output_folder}/{out_name}.csv", index=False)
         except Exception as e:
             print(f"Error saving {out_name}: {e}")
 
-    def print_highest_expense(self):
+    def transactions(self):
+        # Query index over self.df, rebuilt when self.df is replaced or edited in place
+        version = frame_version(self.df)
+        if self._index is None or self._index_version != version:
+            self._index = TransactionIndex(self.df)
+            self._index_version = version
+        return self._index
+
+    def print_highest_expense(self, n=5):
         try:
-            expense_df = self.df[self.df['Amount'] < 0].copy()
-            top_expenses = expense_df.sort_values(by='Amount').head(5)
+            top_expenses = self.transactions().top_expenses(n)
             if not top_expenses.empty:
-                print("Top 5 Highest Expenses:")
+                print(f"Top {n} Highest Expenses:")
                 for index, expense in top_expenses.iterrows():
                     print(f"Date: {expense['Date']}, Amount: {expense['Amount']}, Balance: {expense['Balance']}")
             else:
@@ -96,12 +218,19 @@ class BaseBank(ABC):
         except Exception as e:
             print(f"Error processing highest expenses: {e}")
 
-    def to_standard(self):
+    def to_standard(self, categorize=True):
         try:
-            self.parse_csv()
-            self.df['Date'] = pd.to_datetime(self.df['Date'], errors='coerce')
-            self.df.sort_values(by='Date', inplace=True)
-            self.df['YearMonth'] = self.df['Date'].dt.to_period('M')
-            self.categorize_expenses()
+            profiler = get_profiler()
+            with profiler.stage(self.name, 'parse_csv') as record:
+                self.parse_csv()
+                record['rows'] = len(self.df)
+            with profiler.stage(self.name, 'to_standard', rows=len(self.df)):
+                self.df['Date'] = pd.to_datetime(self.df['Date'], errors='coerce')
+                # Stable, so same-timestamp rows keep the parser's chronological order
+                self.df.sort_values(by='Date', inplace=True, kind='stable')
+                self.df['YearMonth'] = self.df['Date'].dt.to_period('M')
+            if categorize:
+                self.categorize_expenses()
+            compact_transactions(self.df)
         except Exception as e:
             print(f"Error processing {self.name}: {e}")
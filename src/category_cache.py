@@ -0,0 +1,108 @@
+# src/category_cache.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 50000
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_description(description):
+    # Bank exports pad and re-case the same merchant differently from month to month
+    return _WHITESPACE.sub(' ', str(description)).strip().lower()
+
+
+def normalize_descriptions(descriptions):
+    # Vectorized normalize_description over a Series
+    return descriptions.astype(str).str.replace(_WHITESPACE, ' ', regex=True).str.strip().str.lower()
+
+
+def cache_signature(model, candidate_labels):
+    payload = json.dumps({'model': model, 'labels': list(candidate_labels)})
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# On-disk description -> category map with LRU eviction. The file is tied to a
+# model and label set; if either changes the stored entries are dropped on load.
+class CategoryCache:
+
+    def __init__(self, path, model, candidate_labels, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.signature = cache_signature(model, candidate_labels)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable category cache {self.path}: {e}")
+            return
+        if data.get('signature') == self.signature:
+            self.entries = OrderedDict(data.get('entries', {}))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            payload = {'signature': self.signature, 'entries': self.entries}
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        with self._lock:
+            label = self.entries.get(key)
+            if label is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return label
+
+    def put(self, key, label):
+        with self._lock:
+            self.entries[key] = label
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_category_cache(path, model, candidate_labels):
+    # Banks sharing a path, model and label set share one in-memory cache
+    key = (os.path.abspath(path), cache_signature(model, candidate_labels))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = CategoryCache(path, model, candidate_labels)
+        return _caches[key]
+
+
+def clear_category_caches():
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,159 @@
+# src/classifier.py
+
+import sys
+import threading
+import numpy as np
+
+DEFAULT_MODEL = 'typeform/distilbert-base-uncased-mnli'
+DEFAULT_EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# CPU inference backends. Every backend returns the zero-shot pipeline's
+# result shape ({'labels': [...], 'scores': [...]} per description). pytorch is
+# the default; the others have no accuracy numbers yet (benchmarks/bench_backends.py):
+#   pytorch   - fp32 transformers pipeline, one NLI pass per candidate label
+#   quantized - same pipeline with int8 dynamic quantization of the Linear layers (needs torchao)
+#   onnx      - same pipeline on ONNX Runtime (needs optimum[onnxruntime])
+#   embedding - one encoder pass per description, cosine similarity to label embeddings
+BACKENDS = ('pytorch', 'quantized', 'onnx', 'embedding')
+DEFAULT_MODELS = {
+    'pytorch': DEFAULT_MODEL,
+    'quantized': DEFAULT_MODEL,
+    'onnx': DEFAULT_MODEL,
+    'embedding': DEFAULT_EMBEDDING_MODEL,
+}
+
+# One classifier per (model, backend) - and per thread count for onnx - shared by every bank in the process
+_classifiers = {}
+_lock = threading.Lock()
+
+
+def _key(model, backend, threads):
+    # ONNX Runtime sessions own their thread pool. The torch backends share torch's
+    # process-wide setting, so a thread count does not make a different classifier.
+    return (model, backend, threads if backend == 'onnx' else None)
+
+
+def get_classifier(model=DEFAULT_MODEL, backend='pytorch', threads=None):
+    # The model is only loaded the first time someone actually asks for it.
+    # `threads` is the intra-op thread count; None keeps the library default. For the torch
+    # backends it is torch.set_num_threads, which is global: the last value asked for wins.
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend '{backend}', expected one of {BACKENDS}")
+    key = _key(model, backend, threads)
+    with _lock:
+        if key not in _classifiers:
+            _classifiers[key] = _LOADERS[backend](model, threads)
+        if backend != 'onnx':
+            _set_torch_threads(threads)
+        return _classifiers[key]
+
+
+def is_loaded(model=DEFAULT_MODEL, backend='pytorch', threads=None):
+    return _key(model, backend, threads) in _classifiers
+
+
+def clear_classifiers():
+    with _lock:
+        _classifiers.clear()
+
+
+def classifier_id(model, backend='pytorch'):
+    # Identifies whose labels a category cache holds; pytorch keeps the bare
+    # model name so existing caches stay valid
+    return model if backend == 'pytorch' else f"{model}@{backend}"
+
+
+def pipeline(*args, **kwargs):
+    # transformers (and torch) cost seconds to import, so they are only loaded with the first model
+    from transformers import pipeline
+    return pipeline(*args, **kwargs)
+
+
+def _set_torch_threads(threads):
+    # torch is only imported by the loaders; if none of them ran there is nothing to tune
+    torch = sys.modules.get('torch')
+    if threads and torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _load_pytorch(model, threads):
+    return pipeline('zero-shot-classification', model=model)
+
+
+def _load_quantized(model, threads):
+    # torch's own quantize_dynamic is deprecated in favour of torchao
+    try:
+        from torchao.quantization import Int8DynamicActivationInt8WeightConfig, quantize_
+    except ImportError as e:
+        raise ImportError("The quantized backend needs `pip install torchao`") from e
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    int8 = AutoModelForSequenceClassification.from_pretrained(model).eval()
+    quantize_(int8, Int8DynamicActivationInt8WeightConfig())
+    return pipeline('zero-shot-classification', model=int8, tokenizer=AutoTokenizer.from_pretrained(model))
+
+
+def _load_onnx(model, threads):
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError("The onnx backend needs `pip install optimum[onnxruntime]`") from e
+    from transformers import AutoTokenizer
+    options = onnxruntime.SessionOptions()
+    if threads:
+        options.intra_op_num_threads = threads
+    onnx_model = ORTModelForSequenceClassification.from_pretrained(model, export=True, session_options=options)
+    return pipeline('zero-shot-classification', model=onnx_model, tokenizer=AutoTokenizer.from_pretrained(model))
+
+
+def _load_embedding(model, threads):
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    encoder = AutoModel.from_pretrained(model).eval()
+
+    def encode(texts):
+        # Mean pooling over non-padding tokens
+        inputs = tokenizer(list(texts), padding=True, truncation=True, return_tensors='pt')
+        with torch.inference_mode():
+            hidden = encoder(**inputs).last_hidden_state
+        mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+        return ((hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)).numpy()
+
+    return EmbeddingClassifier(encode)
+
+
+_LOADERS = {
+    'pytorch': _load_pytorch,
+    'quantized': _load_quantized,
+    'onnx': _load_onnx,
+    'embedding': _load_embedding,
+}
+
+
+def _normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+# Zero-shot by similarity: candidate labels are encoded once per label set and
+# every description costs a single encoder pass instead of one per label.
+class EmbeddingClassifier:
+    def __init__(self, encode):
+        self.encode = encode
+        self._label_vectors = {}
+
+    def label_vectors(self, candidate_labels):
+        key = tuple(candidate_labels)
+        if key not in self._label_vectors:
+            self._label_vectors[key] = _normalize_rows(self.encode(list(key)))
+        return self._label_vectors[key]
+
+    def __call__(self, descriptions, candidate_labels):
+        single = isinstance(descriptions, str)
+        texts = [descriptions] if single else list(descriptions)
+        scores = _normalize_rows(self.encode(texts)) @ self.label_vectors(candidate_labels).T
+        order = np.argsort(-scores, axis=1, kind='stable')
+        results = [{'labels': [candidate_labels[j] for j in row], 'scores': scores[i, row].tolist()}
+                   for i, row in enumerate(order)]
+        return results[0] if single else results
@@ -0,0 +1,112 @@
+# src/cube.py
+
+import pandas as pd
+from src.metrics import PERIOD_COLUMNS
+
+CELL_COLUMNS = ['Bank', 'Category', 'Day', 'Income', 'Expense', 'Count']
+BALANCE_COLUMNS = ['Bank', 'Day', 'First_Balance', 'Last_Balance']
+
+
+def _day_cells(bank_name, df):
+    # bank x category x day sums plus each day's first and last balance, in row order
+    day = df['Date'].dt.normalize()
+    amount = df['Amount']
+    category = df['Category'].astype(object) if 'Category' in df.columns else 'Uncategorized'
+    cells = pd.DataFrame({
+        'Day': day,
+        'Category': category,
+        'Income': amount.where(amount > 0, 0),
+        'Expense': amount.where(amount < 0, 0),
+        'Count': 1,
+    }).groupby(['Day', 'Category'], sort=True, dropna=False).sum().reset_index()
+    cells.insert(0, 'Bank', bank_name)
+
+    balances = pd.DataFrame({
+        'Day': day,
+        'First_Balance': df['Balance'],
+        'Last_Balance': df['Balance'],
+    }).groupby('Day', sort=True).agg({'First_Balance': 'first', 'Last_Balance': 'last'}).reset_index()
+    balances.insert(0, 'Bank', bank_name)
+    return cells[CELL_COLUMNS], balances[BALANCE_COLUMNS]
+
+
+class RollupCube:
+    # Materialized bank x category x day aggregates. Everything main.py and the plots
+    # summarize (period metrics, combined metrics, category totals) is rolled up from
+    # these cells, so queries cost the number of groups, not the number of transactions.
+    def __init__(self):
+        self.cells = pd.DataFrame(columns=CELL_COLUMNS)
+        self.balances = pd.DataFrame(columns=BALANCE_COLUMNS)
+
+    @property
+    def banks(self):
+        return list(dict.fromkeys(self.balances['Bank']))
+
+    def add_bank(self, bank_name, df):
+        # Replaces everything held for bank_name with the aggregates of df
+        cells, balances = _day_cells(bank_name, df)
+        self.cells = self._replace(self.cells, self.cells['Bank'] == bank_name, cells)
+        self.balances = self._replace(self.balances, self.balances['Bank'] == bank_name, balances)
+
+    def remove_bank(self, bank_name):
+        self.cells = self.cells[self.cells['Bank'] != bank_name].reset_index(drop=True)
+        self.balances = self.balances[self.balances['Bank'] != bank_name].reset_index(drop=True)
+
+    def update_days(self, bank_name, df, days):
+        # Incremental update: recompute only `days` of bank_name from its rows on those days
+        days = pd.DatetimeIndex(pd.to_datetime(list(days))).normalize()
+        rows = df[df['Date'].dt.normalize().isin(days)]
+        cells, balances = _day_cells(bank_name, rows)
+        self.cells = self._replace(self.cells, (self.cells['Bank'] == bank_name) & self.cells['Day'].isin(days), cells)
+        self.balances = self._replace(self.balances, (self.balances['Bank'] == bank_name) & self.balances['Day'].isin(days), balances)
+
+    @staticmethod
+    def _replace(table, stale, fresh):
+        kept = table[~stale]
+        if kept.empty:
+            return fresh.reset_index(drop=True)
+        return pd.concat([kept, fresh], ignore_index=True).sort_values(['Bank', 'Day'], kind='stable', ignore_index=True)
+
+    def _select(self, table, bank_name):
+        return table if bank_name is None else table[table['Bank'] == bank_name]
+
+    def metrics(self, bank_name=None, freq='M'):
+        # Same table as period_metrics; without bank_name, per-bank metrics are summed per period
+        if bank_name is None:
+            tables = [self.metrics(name, freq) for name in self.banks]
+            period_column = PERIOD_COLUMNS[freq]
+            if not tables:
+                return pd.DataFrame(columns=[period_column, 'Total_Income', 'Total_Expense', 'Balance_Beginning', 'Balance_Ending'])
+            return pd.concat(tables).groupby(period_column).sum().reset_index()
+
+        period_column = PERIOD_COLUMNS[freq]
+        cells = self._select(self.cells, bank_name)
+        balances = self._select(self.balances, bank_name)
+        totals = cells.groupby(cells['Day'].dt.to_period(freq).rename(period_column))[['Income', 'Expense']].sum()
+        by_period = balances.groupby(balances['Day'].dt.to_period(freq).rename(period_column))
+        metrics = pd.DataFrame({
+            'Total_Income': totals['Income'],
+            'Total_Expense': totals['Expense'].abs(),
+            'Balance_Beginning': by_period['First_Balance'].first(),
+            'Balance_Ending': by_period['Last_Balance'].last(),
+        }).reset_index()
+        return metrics
+
+    def category_totals(self, bank_name=None, start_date=None, end_date=None):
+        # Total spent per category, largest first
+        cells = self._select(self.cells, bank_name)
+        if start_date is not None:
+            cells = cells[cells['Day'] >= pd.Timestamp(start_date).normalize()]
+        if end_date is not None:
+            cells = cells[cells['Day'] <= pd.Timestamp(end_date)]
+        totals = cells.groupby('Category')['Expense'].sum().abs()
+        return totals[totals > 0].sort_values(ascending=False)
+
+    def save(self, path):
+        pd.to_pickle((self.cells, self.balances), path)
+
+    @classmethod
+    def load(cls, path):
+        cube = cls()
+        cube.cells, cube.balances = pd.read_pickle(path)
+        return cube
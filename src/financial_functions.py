@@ -0,0 +1,27 @@
+# src/financial_functions.py
+
+import numpy as np
+import pandas as pd
+
+
+def date_bounds(dates, start_date=None, end_date=None):
+    # Positions [lo, hi) of a sorted datetime column falling inside [start_date, end_date]
+    values = dates.to_numpy() if hasattr(dates, 'to_numpy') else np.asarray(dates)
+    lo = 0 if start_date is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(start_date)), side='left'))
+    hi = len(values) if end_date is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(end_date)), side='right'))
+    return lo, max(lo, hi)
+
+
+def filter_date_range(df, start_date=None, end_date=None):
+    # Rows with start_date <= Date <= end_date; either bound may be None
+    if start_date is None and end_date is None:
+        return df
+    if df['Date'].is_monotonic_increasing:
+        lo, hi = date_bounds(df['Date'], start_date, end_date)
+        return df.iloc[lo:hi]
+    mask = pd.Series(True, index=df.index)
+    if start_date is not None:
+        mask &= df['Date'] >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= df['Date'] <= pd.Timestamp(end_date)
+    return df[mask]
@@ -0,0 +1,164 @@
+# src/incremental.py
+
+import json
+import os
+import pandas as pd
+from src.cube import RollupCube
+from src.financial_functions import filter_date_range
+from src.metrics import PERIOD_COLUMNS, period_metrics
+from src.schema import compact_transactions
+
+FINGERPRINT_COLUMNS = ['Date', 'Amount', 'Balance', 'Description']
+CUBE_FILE = 'cube.pkl'
+CUBE_WINDOW_FILE = 'cube.json'
+
+
+def row_fingerprints(df):
+    # Stable per-row hash; identical rows are told apart by their occurrence number
+    rows = df[FINGERPRINT_COLUMNS].copy()
+    rows['Occurrence'] = rows.groupby(FINGERPRINT_COLUMNS, dropna=False, sort=False, observed=True).cumcount()
+    return pd.util.hash_pandas_object(rows, index=False)
+
+
+class BankState:
+    # Everything persisted for one bank export between runs: the standardized and
+    # categorized transactions with their fingerprints, the per-period metrics and
+    # a small JSON summary of what was processed last.
+    def __init__(self, state_folder, bank):
+        stem = os.path.splitext(os.path.basename(bank.csv_path))[0]
+        self.folder = os.path.join(state_folder, f"{bank.name}_{stem}")
+        self.transactions_path = os.path.join(self.folder, 'transactions.pkl')
+        self.metrics_path = os.path.join(self.folder, 'metrics.pkl')
+        self.summary_path = os.path.join(self.folder, 'state.json')
+
+    def load(self):
+        if not os.path.exists(self.summary_path):
+            return None, None, {}
+        with open(self.summary_path, encoding='utf-8') as f:
+            summary = json.load(f)
+        return pd.read_pickle(self.transactions_path), pd.read_pickle(self.metrics_path), summary
+
+    def save(self, transactions, metrics, summary):
+        os.makedirs(self.folder, exist_ok=True)
+        transactions.to_pickle(self.transactions_path)
+        metrics.to_pickle(self.metrics_path)
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return {'csv_size': stat.st_size, 'csv_mtime': stat.st_mtime}
+
+
+def _cube_window(start_date, end_date):
+    return {'start_date': None if start_date is None else str(pd.Timestamp(start_date)),
+            'end_date': None if end_date is None else str(pd.Timestamp(end_date))}
+
+
+def load_cube(state_folder, start_date=None, end_date=None):
+    # The rollup cube saved by the last incremental run, if it covered the same date window.
+    # The files are removed once loaded, so a run that dies before save_cube leaves no cube
+    # behind that is older than the bank states it already saved; the next run rebuilds it.
+    cube_path = os.path.join(state_folder, CUBE_FILE)
+    window_path = os.path.join(state_folder, CUBE_WINDOW_FILE)
+    cube = RollupCube()
+    if os.path.exists(cube_path) and os.path.exists(window_path):
+        with open(window_path, encoding='utf-8') as f:
+            if json.load(f) == _cube_window(start_date, end_date):
+                cube = RollupCube.load(cube_path)
+    for path in (cube_path, window_path):
+        if os.path.exists(path):
+            os.remove(path)
+    return cube
+
+
+def save_cube(cube, state_folder, start_date=None, end_date=None):
+    os.makedirs(state_folder, exist_ok=True)
+    cube.save(os.path.join(state_folder, CUBE_FILE))
+    with open(os.path.join(state_folder, CUBE_WINDOW_FILE), 'w', encoding='utf-8') as f:
+        json.dump(_cube_window(start_date, end_date), f, indent=2)
+
+
+def incremental_update(bank, state_folder, freq='M', categorize=True, cube=None, start_date=None, end_date=None):
+    # Bring bank.df and its per-period metrics up to date with the export on disk.
+    # Rows seen in a previous run keep their category; only new rows are categorized and
+    # only periods with new, changed or removed rows have their metrics recomputed.
+    # With categorize=False new rows are stored uncategorized and picked up by the next
+    # run that categorizes. A rollup cube holding the rows in [start_date, end_date] (see
+    # load_cube) is kept up to date too: only the days of new, changed or removed rows
+    # are recomputed.
+    state = BankState(state_folder, bank)
+    previous, metrics, summary = state.load()
+    period_column = PERIOD_COLUMNS[freq]
+
+    try:
+        signature = _file_signature(bank.csv_path)
+    except OSError as e:
+        # Same outcome as a failed parse: bank.df stays None and the caller skips the bank
+        print(f"Error processing {bank.name}: {e}")
+        return None
+    uncategorized = previous is not None and categorize and previous['Category'].isna().any()
+    if previous is not None and not uncategorized and all(summary.get(key) == value for key, value in signature.items()):
+        bank.df = previous.drop(columns=['Fingerprint'])
+        if cube is not None and bank.name not in cube.banks:
+            cube.add_bank(bank.name, filter_date_range(bank.df, start_date, end_date))
+        print(f"{bank.name}: {bank.csv_path} unchanged since last run")
+        return metrics
+
+    bank.to_standard(categorize=False)
+    if bank.df is None:
+        return None
+    df = bank.df
+    fingerprints = row_fingerprints(df)
+
+    if previous is None:
+        known = pd.Series(False, index=df.index)
+        removed = df.iloc[0:0]
+    else:
+        known = fingerprints.isin(previous['Fingerprint'])
+        removed = previous[~previous['Fingerprint'].isin(fingerprints)]
+
+    categories = pd.Series(None, index=df.index, dtype=object)
+    sources = pd.Series(None, index=df.index, dtype=object)
+    if known.any():
+        previous_categories = previous.drop_duplicates('Fingerprint').set_index('Fingerprint')
+        categories[known] = previous_categories['Category'].reindex(fingerprints[known]).to_numpy()
+        sources[known] = previous_categories['Category_Source'].reindex(fingerprints[known]).to_numpy()
+    pending = categories.isna()
+    if categorize and pending.any():
+        categories[pending], sources[pending] = bank.categorize(df.loc[pending, 'Description'],
+                                                                    df.loc[pending, 'Amount'])
+    df['Category'] = categories
+    df['Category_Source'] = sources
+    compact_transactions(df)
+
+    if cube is not None:
+        window = filter_date_range(df, start_date, end_date)
+        if previous is None or bank.name not in cube.banks:
+            cube.add_bank(bank.name, window)
+        else:
+            touched = set(df.loc[pending | ~known, 'Date'].dt.normalize()) | set(removed['Date'].dt.normalize())
+            if touched:
+                cube.update_days(bank.name, window, touched)
+
+    periods = df['Date'].dt.to_period(freq)
+    if metrics is None:
+        metrics = period_metrics(df, freq)
+        changed = set(periods)
+    else:
+        changed = set(periods[~known]) | set(removed['Date'].dt.to_period(freq))
+        if changed:
+            kept = metrics[~metrics[period_column].isin(changed)]
+            recomputed = period_metrics(df[periods.isin(changed)], freq)
+            metrics = pd.concat([kept, recomputed]).sort_values(period_column).reset_index(drop=True)
+
+    print(f"{bank.name}: {(~known).sum()} new rows, {len(removed)} removed, {len(changed)} periods recomputed")
+
+    last = df.dropna(subset=['Date']).iloc[-1] if df['Date'].notna().any() else None
+    summary = dict(signature,
+                   rows=len(df),
+                   last_date=None if last is None else str(last['Date']),
+                   last_balance=None if last is None else float(last['Balance']))
+    state.save(df.assign(Fingerprint=fingerprints), metrics, summary)
+    return metrics
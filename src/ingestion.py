@@ -0,0 +1,19 @@
+# src/ingestion.py
+
+from src.profiling import Profiler, set_profiler
+from src.schema import compact_transactions
+
+
+def standardize_file(bank_class, name, csv_path, profile):
+    # Runs in a worker process; stage timings recorded there are sent back with the frame
+    profiler = set_profiler(Profiler() if profile else None)
+    bank = bank_class(name, csv_path)
+    bank.to_standard(categorize=False)
+    return bank.df, profiler.stages
+
+
+def categorize_standardized(bank):
+    # Categorize a frame produced by to_standard(categorize=False) and compact the new columns
+    bank.categorize_expenses()
+    compact_transactions(bank.df)
+
@@ -0,0 +1,110 @@
+# src/metrics.py
+
+import pandas as pd
+from src.financial_functions import filter_date_range
+
+# Granularity -> name of the period column in the metrics table
+PERIOD_COLUMNS = {'D': 'Day', 'W': 'Week', 'M': 'YearMonth', 'Y': 'Year'}
+
+
+def period_metrics(df, freq='M'):
+    # Income, expense and opening/closing balance per period in a single groupby; df is not modified
+    if freq not in PERIOD_COLUMNS:
+        raise ValueError(f"Unsupported frequency '{freq}', expected one of {list(PERIOD_COLUMNS)}.")
+    period_column = PERIOD_COLUMNS[freq]
+    if freq == 'M' and 'YearMonth' in df.columns:
+        periods = df['YearMonth']
+    else:
+        periods = df['Date'].dt.to_period(freq)
+
+    amount = df['Amount']
+    frame = pd.DataFrame({
+        period_column: periods,
+        'Total_Income': amount.where(amount > 0, 0),
+        'Total_Expense': amount.where(amount < 0, 0),
+        'Balance_Beginning': df['Balance'],
+        'Balance_Ending': df['Balance'],
+    })
+    metrics = frame.groupby(period_column).agg({
+        'Total_Income': 'sum',
+        'Total_Expense': 'sum',
+        'Balance_Beginning': 'first',
+        'Balance_Ending': 'last',
+    }).reset_index()
+    metrics['Total_Expense'] = metrics['Total_Expense'].abs()
+    return metrics
+
+
+def streaming_period_metrics(chunks, freq='M', newest_first=False):
+    # Same table as period_metrics, built from an iterable of standardized chunks. Only one
+    # chunk and the small per-period partial aggregates are held in memory at a time.
+    # Rows inside a chunk must be chronological; newest_first says the chunks come in
+    # reverse order, which decides ties between chunks that share a timestamp.
+    if freq not in PERIOD_COLUMNS:
+        raise ValueError(f"Unsupported frequency '{freq}', expected one of {list(PERIOD_COLUMNS)}.")
+    period_column = PERIOD_COLUMNS[freq]
+    partials = []
+    for i, chunk in enumerate(chunks):
+        chunk = chunk.sort_values('Date', kind='stable')
+        amount = chunk['Amount']
+        partials.append(pd.DataFrame({
+            period_column: chunk['Date'].dt.to_period(freq),
+            'Total_Income': amount.where(amount > 0, 0),
+            'Total_Expense': amount.where(amount < 0, 0),
+            'First_Date': chunk['Date'],
+            'Last_Date': chunk['Date'],
+            'Balance_Beginning': chunk['Balance'],
+            'Balance_Ending': chunk['Balance'],
+        }).groupby(period_column).agg({
+            'Total_Income': 'sum',
+            'Total_Expense': 'sum',
+            'First_Date': 'min',
+            'Last_Date': 'max',
+            'Balance_Beginning': 'first',
+            'Balance_Ending': 'last',
+        }).assign(Sequence=-i if newest_first else i))
+
+    columns = [period_column, 'Total_Income', 'Total_Expense', 'Balance_Beginning', 'Balance_Ending']
+    if not partials:
+        return pd.DataFrame(columns=columns)
+
+    combined = pd.concat(partials)
+    by_period = combined.groupby(level=0)
+    metrics = by_period[['Total_Income', 'Total_Expense']].sum()
+    # Partials that start or end on the same timestamp are ordered by chunk sequence
+    metrics['Balance_Beginning'] = combined.sort_values(['First_Date', 'Sequence']).groupby(level=0)['Balance_Beginning'].first()
+    metrics['Balance_Ending'] = combined.sort_values(['Last_Date', 'Sequence']).groupby(level=0)['Balance_Ending'].last()
+    metrics = metrics.reset_index()[columns]
+    metrics['Total_Expense'] = metrics['Total_Expense'].abs()
+    return metrics
+
+
+def periods_between(metrics, start_date=None, end_date=None, freq='M'):
+    # Rows of a period_metrics table whose period overlaps [start_date, end_date]
+    periods = metrics[PERIOD_COLUMNS[freq]]
+    mask = pd.Series(True, index=metrics.index)
+    if start_date is not None:
+        mask &= periods.dt.end_time >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= periods.dt.start_time <= pd.Timestamp(end_date)
+    return metrics[mask].reset_index(drop=True)
+
+
+def clip_periods(metrics, df, start_date=None, end_date=None, freq='M'):
+    # A stored whole-period metrics table restricted to [start_date, end_date], matching
+    # period_metrics(filter_date_range(df, start_date, end_date)). Periods cut by either bound
+    # are recomputed from df's rows inside the window; all others are reused as they are.
+    period_column = PERIOD_COLUMNS[freq]
+    metrics = periods_between(metrics, start_date, end_date, freq)
+    periods = metrics[period_column]
+    partial = pd.Series(False, index=metrics.index)
+    if start_date is not None:
+        partial |= periods.dt.start_time < pd.Timestamp(start_date)
+    if end_date is not None:
+        partial |= periods.dt.end_time > pd.Timestamp(end_date)
+    if not partial.any():
+        return metrics
+    rows = filter_date_range(df, start_date, end_date)
+    rows = rows[rows['Date'].dt.to_period(freq).isin(set(periods[partial]))]
+    recomputed = period_metrics(rows, freq)
+    return pd.concat([metrics[~partial], recomputed]).sort_values(period_column).reset_index(drop=True)
@@ -1,25 +1,64 @@
 # src/openbank.py
 
+import csv
 import pandas as pd
 from src.base_bank import BaseBank
 
+HEADER_ROWS = 10
+COLUMNS = ["Fecha Operación", "Fecha Valor", "Concepto", "Importe", "Saldo"]
+
+# "1.766,92" -> "1766.92" in a single pass over each string
+_SPANISH_NUMBER = str.maketrans({'.': None, ',': '.'})
+
+
+def parse_spanish_numbers(values):
+    return pd.to_numeric(values.str.translate(_SPANISH_NUMBER), errors='coerce')
+
 
 class Openbank(BaseBank): 
+    # Exports list movements newest first
+    chunks_newest_first = True
+
     def parse_csv(self):
-        df = pd.read_csv(self.csv_path, sep=";", skiprows=10)
-        num_cols = len(df.columns)
-        df.columns = ["Col" + str(i) for i in range(num_cols)]
-        df.ffill(inplace=True)
-        nan_cols = [col for col in df.columns if df[col].isnull().all()]
-        df.drop(columns=nan_cols, inplace=True)
-        df.dropna(how='all', axis=0, inplace=True)
-        df.reset_index(drop=True, inplace=True)
-        df.columns = ["Fecha Operación", "Fecha Valor", "Concepto", "Importe", "Saldo"]
-        df['Date'] = pd.to_datetime(df['Fecha Operación'], format="%d/%m/%Y", errors='coerce')
-        df['Amount'] = pd.to_numeric(df['Importe'].str.replace('.', '').str.replace(',', '.'), errors='coerce')
-        df['Balance'] = pd.to_numeric(df['Saldo'].str.replace('.', '').str.replace(',', '.'), errors='coerce')
-        df = df.dropna(subset=['Date'])
-        df['Description'] = df['Concepto']
-
-        df['Bank'] = 'Openbank'
-        self.df = df[['Date', 'Amount', 'Balance', 'Description', 'Bank']]
\ No newline at end of file
+        # Chunks come newest first and each one is already chronological
+        chunks = list(self.iter_csv_chunks())[::-1]
+        self.df = pd.concat(chunks, ignore_index=True) if chunks else self._standardize_chunk(pd.DataFrame(columns=COLUMNS))
+
+    def iter_csv_chunks(self, chunksize=100_000):
+        # The export spreads every field over two `;`-separated columns; only the
+        # positions that are named in the header line hold data. Rows within each
+        # chunk are put in chronological order; the chunks themselves go newest first.
+        # Same-day movements only have day precision, so file order is all that
+        # tells which one came last.
+        reader = pd.read_csv(self.csv_path, sep=";", skiprows=HEADER_ROWS + 1, header=None,
+                             usecols=self._data_columns(), dtype=str, chunksize=chunksize)
+        previous = None
+        for chunk in reader:
+            chunk.columns = COLUMNS
+            chunk = chunk.dropna(how='all')
+            if chunk.empty:
+                continue
+            # Forward-fill continues from the last row of the previous chunk
+            if previous is not None:
+                chunk = pd.concat([previous, chunk]).ffill().iloc[1:]
+            else:
+                chunk = chunk.ffill()
+            previous = chunk.iloc[[-1]]
+            yield self._standardize_chunk(chunk.iloc[::-1])
+
+    def _data_columns(self):
+        with open(self.csv_path, newline='', encoding='utf-8-sig') as f:
+            for _ in range(HEADER_ROWS):
+                next(f)
+            header = next(csv.reader(f, delimiter=';'))
+        return [i for i, name in enumerate(header) if name.strip()]
+
+    def _standardize_chunk(self, chunk):
+        df = pd.DataFrame({
+            'Date': pd.to_datetime(chunk['Fecha Operación'], format="%d/%m/%Y", errors='coerce'),
+            'Amount': parse_spanish_numbers(chunk['Importe']),
+            'Balance': parse_spanish_numbers(chunk['Saldo']),
+            'Description': chunk['Concepto'],
+            'Bank': 'Openbank',
+        })
+        return df.dropna(subset=['Date'])
@@ -0,0 +1,64 @@
+# src/pipeline.py
+
+import asyncio
+
+_DONE = object()
+
+
+async def _run_stage(stage, inbox, outbox):
+    # One task per stage, so items leave every stage in the order they entered it
+    while True:
+        item = await inbox.get()
+        if item is _DONE:
+            break
+        item = await stage(item)
+        if outbox is not None:
+            await outbox.put(item)
+    if outbox is not None:
+        await outbox.put(_DONE)
+
+
+async def _feed(items, queue):
+    for item in items:
+        await queue.put(item)
+    await queue.put(_DONE)
+
+
+async def run_stages(items, stages, queue_size=1):
+    # Push items through a chain of coroutine stages connected by bounded queues.
+    # Stage k works on item n while stage k-1 already works on item n+1; a full queue
+    # blocks the stage feeding it, so at most ~queue_size items wait between two stages.
+    queues = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+    tasks = [asyncio.create_task(_feed(items, queues[0]))]
+    for i, stage in enumerate(stages):
+        outbox = queues[i + 1] if i + 1 < len(stages) else None
+        tasks.append(asyncio.create_task(_run_stage(stage, queues[i], outbox)))
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # A failing stage would leave its neighbours blocked on a queue forever
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class BackgroundWriter:
+    # Runs blocking writes (CSV, Parquet, plots) in an executor without holding up the
+    # pipeline. submit() waits once max_pending writes are in flight; drain() waits for
+    # all of them and re-raises the first failure.
+    def __init__(self, executor, max_pending=2):
+        self.executor = executor
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending = []
+
+    async def submit(self, func, *args):
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending.append(future)
+        return future
+
+    async def drain(self):
+        pending, self._pending = self._pending, []
+        await asyncio.gather(*pending)
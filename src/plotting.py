@@ -1,39 +1,73 @@
 # src/plotting.py
 
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
-import seaborn as sns
+from src.timeline import BalanceTimeline, downsample_lttb
 
-def plot_balances(banks, output_folder):
-    num_banks = len(banks)
-    colors = plt.cm.get_cmap('tab10', num_banks)
+# Bump when a renderer changes so cached figures are redrawn
+PLOT_CACHE_VERSION = 2
+PLOT_MANIFEST = '.plot_hashes.json'
+# Longer daily series are downsampled before drawing
+MAX_PLOT_POINTS = 2000
 
-    fig = plt.figure(figsize=(10, 4 * (num_banks + 1)))
-    gs = GridSpec(num_banks + 1, 1, figure=fig)
-    
-    total_balance = None
 
-    for i, bank in enumerate(banks):
-        balance = bank.df[['Date', 'Balance']].copy()
-        balance['Date'] = pd.to_datetime(balance['Date'])
-        balance.set_index('Date', inplace=True)
-        balance = balance[~balance.index.duplicated(keep='last')]
-        balance = balance.resample('D').ffill()
+# Plot-ready aggregates, computed once per run from the bank frames
+
+def balance_data(banks, max_points=MAX_PLOT_POINTS):
+    # Per-bank and total daily balances on one aligned index, downsampled for long ranges
+    timeline = BalanceTimeline.from_banks(banks)
+    balances = [(name, downsample_lttb(timeline.bank(i), max_points)) for i, name in enumerate(timeline.names)]
+    return balances, downsample_lttb(timeline.total(), max_points)
+
+
+def income_expense_data(df):
+    return df[['YearMonth', 'Total_Income', 'Total_Expense']].copy()
+
+
+def category_data(banks, cube=None):
+    # Per-bank category totals; the combined totals are their sum, so banks are never concatenated.
+    # With a rollup cube the totals come straight from its aggregates.
+    if cube is not None:
+        return [(bank.name, cube.category_totals(bank.name)) for bank in banks], cube.category_totals()
+    bank_totals = []
+    for bank in banks:
+        expenses = bank.df[bank.df['Amount'] < 0]
+        category_totals = expenses.groupby('Category', observed=True)['Amount'].sum().abs().sort_values(ascending=False)
+        category_totals.index = category_totals.index.astype(str)
+        bank_totals.append((bank.name, category_totals))
+    totals = [category_totals for _, category_totals in bank_totals]
+    combined = pd.concat(totals).groupby(level=0).sum().sort_values(ascending=False) if totals else pd.Series(dtype=float)
+    return bank_totals, combined
+
+
+# Renderers: object-oriented Agg figures only, so they are safe to run in worker processes.
+# matplotlib and seaborn are imported on first render so metrics-only runs never load them.
+
+def render_balances(data, path):
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.gridspec import GridSpec
+    balances, total_balance = data
+    num_banks = len(balances)
+    colors = matplotlib.colormaps['tab10'].resampled(max(num_banks, 1))
+
+    fig = Figure(figsize=(10, 4 * (num_banks + 1)))
+    gs = GridSpec(num_banks + 1, 1, figure=fig)
 
+    for i, (name, balance) in enumerate(balances):
         ax = fig.add_subplot(gs[i, 0])
-        ax.plot(balance.index, balance['Balance'], label=bank.name, color=colors(i))
-        ax.set_title(f'{bank.name} Balance Over Time')
+        ax.plot(balance.index, balance, label=name, color=colors(i))
+        ax.set_title(f'{name} Balance Over Time')
         ax.set_xlabel('Date')
         ax.set_ylabel('Balance')
         ax.legend()
         ax.grid(True)
 
-        if total_balance is None:
-            total_balance = balance['Balance']
-        else:
-            total_balance += balance['Balance']
-
     ax_total = fig.add_subplot(gs[num_banks, 0])
     ax_total.plot(total_balance.index, total_balance, label='Total Balance', linestyle='--', color='black')
     ax_total.set_title('Total Balance Over Time')
@@ -42,72 +76,129 @@ def plot_balances(banks, output_folder):
     ax_total.legend()
     ax_total.grid(True)
 
-    plt.subplots_adjust(hspace=0.5)
-    plt.savefig(f"{output_folder}/balance_plot.png")
-    plt.close()
+    fig.subplots_adjust(hspace=0.5)
+    fig.savefig(path)
 
 
-def plot_income_vs_expenses(df, output_folder):
-    plt.figure(figsize=(10, 6))
-    plt.plot(df['YearMonth'].dt.to_timestamp(), df['Total_Income'], label='Total Income', color='green', marker='o')
-    plt.plot(df['YearMonth'].dt.to_timestamp(), df['Total_Expense'], label='Total Expense', color='red', marker='o')
-    plt.title('Monthly Income vs Expenses')
-    plt.xlabel('Month')
-    plt.ylabel('Amount')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig(f"{output_folder}/income_vs_expenses_plot.png")
-    plt.close()
+def render_income_vs_expenses(df, path):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.plot(df['YearMonth'].dt.to_timestamp(), df['Total_Income'], label='Total Income', color='green', marker='o')
+    ax.plot(df['YearMonth'].dt.to_timestamp(), df['Total_Expense'], label='Total Expense', color='red', marker='o')
+    ax.set_title('Monthly Income vs Expenses')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Amount')
+    ax.legend()
+    ax.grid(True)
+    fig.savefig(path)
 
 
-def plot_expense_categories(banks, output_folder):
-    num_banks = len(banks)
-    
+def _category_barplot(ax, category_totals, title):
+    import seaborn as sns
+    sns.barplot(x=category_totals.values, y=category_totals.index, hue=category_totals.index, palette='Blues_d', ax=ax, legend=False)
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel('Total Amount Spent (€)', fontsize=12)
+    ax.set_ylabel('Category', fontsize=12)
+
+    # Add annotations to each bar
+    for j in range(len(category_totals)):
+        ax.text(category_totals.values[j], j, f'{category_totals.values[j]:.2f}€', va='center', ha='left', fontsize=10)
+
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+
+
+def render_expense_categories(categories, path):
+    from matplotlib.figure import Figure
+    from matplotlib.gridspec import GridSpec
+    bank_totals, combined = categories
+    num_banks = len(bank_totals)
+
     # Set up the GridSpec layout
-    fig = plt.figure(figsize=(12, 6 + 4 * num_banks))
+    fig = Figure(figsize=(12, 6 + 4 * num_banks))
     gs = GridSpec(num_banks + 1, 1, figure=fig)
-    
-    # Combine all bank data into one DataFrame for the total plot
-    all_expenses = pd.concat([bank.df for bank in banks])
-    
+
     # Plot each bank's expense categories
-    for i, bank in enumerate(banks):
-        # Filter for only expenses (negative amounts) for the bank
-        expense_categories = bank.df[bank.df['Amount'] < 0]
-        
-        # Group by category and sum the expenses
-        category_totals = expense_categories.groupby('Category')['Amount'].sum().abs().sort_values(ascending=False)
-        
-        # Create subplot for the individual bank
-        ax = fig.add_subplot(gs[i, 0])
-        sns.barplot(x=category_totals.values, y=category_totals.index, hue=category_totals.index, palette='Blues_d', ax=ax, legend=False)
-        ax.set_title(f'Total Expenses by Category - {bank.name}', fontsize=14)
-        ax.set_xlabel('Total Amount Spent (€)', fontsize=12)
-        ax.set_ylabel('Category', fontsize=12)
-        
-        # Add annotations to each bar
-        for j in range(len(category_totals)):
-            ax.text(category_totals.values[j], j, f'{category_totals.values[j]:.2f}€', va='center', ha='left', fontsize=10)
-        
-        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-    
+    for i, (name, category_totals) in enumerate(bank_totals):
+        _category_barplot(fig.add_subplot(gs[i, 0]), category_totals, f'Total Expenses by Category - {name}')
+
     # Plot for combined total expenses
-    expense_categories_total = all_expenses[all_expenses['Amount'] < 0]
-    category_totals_total = expense_categories_total.groupby('Category')['Amount'].sum().abs().sort_values(ascending=False)
-    
-    # Create subplot for the combined total
-    ax_total = fig.add_subplot(gs[num_banks, 0])
-    sns.barplot(x=category_totals_total.values, y=category_totals_total.index, hue=category_totals_total.index, palette='Blues_d', ax=ax_total, legend=False)
-    ax_total.set_title('Total Expenses by Category - Combined', fontsize=14)
-    ax_total.set_xlabel('Total Amount Spent (€)', fontsize=12)
-    ax_total.set_ylabel('Category', fontsize=12)
-    
-    # Add annotations to each bar for the total plot
-    for j in range(len(category_totals_total)):
-        ax_total.text(category_totals_total.values[j], j, f'{category_totals_total.values[j]:.2f}€', va='center', ha='left', fontsize=10)
-    
-    ax_total.grid(True, axis='x', linestyle='--', alpha=0.7)
-    
-    plt.tight_layout()
-    plt.savefig(f"{output_folder}/expense_categories_by_bank_and_total.png")
-    plt.close()
+    _category_barplot(fig.add_subplot(gs[num_banks, 0]), combined, 'Total Expenses by Category - Combined')
+
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+# Single-figure entry points
+
+def plot_balances(banks, output_folder):
+    render_balances(balance_data(banks), f"{output_folder}/balance_plot.png")
+
+
+def plot_income_vs_expenses(df, output_folder):
+    render_income_vs_expenses(income_expense_data(df), f"{output_folder}/income_vs_expenses_plot.png")
+
+
+def plot_expense_categories(banks, output_folder):
+    render_expense_categories(category_data(banks), f"{output_folder}/expense_categories_by_bank_and_total.png")
+
+
+# Cached rendering of every figure
+
+def data_hash(data):
+    digest = hashlib.sha256(str(PLOT_CACHE_VERSION).encode())
+
+    def update(value):
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            digest.update(repr((getattr(value, 'name', None), list(getattr(value, 'columns', [])))).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        elif isinstance(value, (list, tuple)):
+            digest.update(f'[{len(value)}'.encode())
+            for item in value:
+                update(item)
+        else:
+            digest.update(repr(value).encode())
+
+    update(data)
+    return digest.hexdigest()
+
+
+def render_plots(banks, combined_metrics_df, output_folder, workers=1, cube=None):
+    # Draws every figure whose input data changed since the last render; returns the files written
+    os.makedirs(output_folder, exist_ok=True)
+    figures = [
+        ('balance_plot.png', render_balances, balance_data(banks)),
+        ('income_vs_expenses_plot.png', render_income_vs_expenses, income_expense_data(combined_metrics_df)),
+        ('expense_categories_by_bank_and_total.png', render_expense_categories, category_data(banks, cube)),
+    ]
+
+    manifest_path = os.path.join(output_folder, PLOT_MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    stale = []
+    for file_name, renderer, data in figures:
+        digest = data_hash(data)
+        path = os.path.join(output_folder, file_name)
+        if manifest.get(file_name) == digest and os.path.exists(path):
+            continue
+        stale.append((file_name, renderer, data, path, digest))
+
+    if workers > 1 and len(stale) > 1:
+        # Plots render on a background thread in main.py, so workers are spawned rather than forked
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [executor.submit(renderer, data, path) for _, renderer, data, path, _ in stale]
+            for future in futures:
+                future.result()
+    else:
+        for _, renderer, data, path, _ in stale:
+            renderer(data, path)
+
+    for file_name, _, _, _, digest in stale:
+        manifest[file_name] = digest
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    return [file_name for file_name, _, _, _, _ in stale]
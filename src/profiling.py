@@ -0,0 +1,127 @@
+# src/profiling.py
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+def peak_rss_mb():
+    # High-water mark over the whole life of the process, not of any one stage
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def rss_mb():
+    # Current resident set size; None where /proc is not available
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+class Profiler:
+    # Records wall time, CPU time, rows and memory for each pipeline stage, plus the
+    # latency of every classifier batch. Memory is the RSS when the stage ends and how much
+    # it grew during the stage (stages overlapping in other threads count too), next to the
+    # process-lifetime peak. Two clock reads, two RSS reads and one getrusage per stage.
+    enabled = True
+
+    def __init__(self):
+        self.stages = []
+        self.batches = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, bank, name, rows=None):
+        # The yielded record can be updated inside the block, e.g. record['rows'] = len(df)
+        record = {'bank': bank, 'stage': name, 'rows': rows, 'error': None}
+        wall, cpu, rss = time.perf_counter(), time.process_time(), rss_mb()
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = repr(e)
+            raise
+        finally:
+            record['wall_s'] = time.perf_counter() - wall
+            record['cpu_s'] = time.process_time() - cpu
+            record['rows_per_s'] = record['rows'] / record['wall_s'] if record['rows'] and record['wall_s'] > 0 else None
+            record['rss_mb'] = rss_mb()
+            record['rss_delta_mb'] = record['rss_mb'] - rss if rss is not None and record['rss_mb'] is not None else None
+            record['process_peak_rss_mb'] = peak_rss_mb()
+            with self._lock:
+                self.stages.append(record)
+
+    def record_batch(self, bank, size, seconds):
+        with self._lock:
+            self.batches.append({'bank': bank, 'size': size, 'latency_s': seconds})
+
+    def extend(self, stages, batches=()):
+        # Merge records collected in another process
+        with self._lock:
+            self.stages.extend(stages)
+            self.batches.extend(batches)
+
+    def stages_frame(self):
+        columns = ['bank', 'stage', 'rows', 'wall_s', 'cpu_s', 'rows_per_s', 'rss_mb', 'rss_delta_mb',
+                   'process_peak_rss_mb', 'error']
+        return pd.DataFrame(self.stages, columns=columns)
+
+    def batches_frame(self):
+        return pd.DataFrame(self.batches, columns=['bank', 'size', 'latency_s'])
+
+    def write_report(self, output_folder, name='profile'):
+        os.makedirs(output_folder, exist_ok=True)
+        stages = self.stages_frame()
+        batches = self.batches_frame()
+        stages.to_csv(os.path.join(output_folder, f"{name}.csv"), index=False)
+        batches.to_csv(os.path.join(output_folder, f"{name}_batches.csv"), index=False)
+        totals = stages.groupby('stage', sort=False)[['wall_s', 'cpu_s']].sum().reset_index()
+        report = {
+            'stages': stages.astype(object).where(stages.notna(), None).to_dict(orient='records'),
+            'stage_totals': totals.to_dict(orient='records'),
+            'classifier_batches': {
+                'count': len(batches),
+                'rows': int(batches['size'].sum()) if len(batches) else 0,
+                'latency_s': batches['latency_s'].describe().to_dict() if len(batches) else {},
+            },
+            'process_peak_rss_mb': peak_rss_mb(),
+        }
+        with open(os.path.join(output_folder, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+class NullProfiler(Profiler):
+    # Used when profiling is off: stages cost a context-manager entry and nothing else
+    enabled = False
+
+    @contextmanager
+    def stage(self, bank, name, rows=None):
+        yield {}
+
+    def record_batch(self, bank, size, seconds):
+        pass
+
+    def extend(self, stages, batches=()):
+        pass
+
+
+_profiler = NullProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+def set_profiler(profiler):
+    global _profiler
+    _profiler = profiler if profiler is not None else NullProfiler()
+    return _profiler
@@ -0,0 +1,88 @@
+# src/query.py
+
+import numpy as np
+import pandas as pd
+from src.financial_functions import date_bounds
+
+
+def _column_checksum(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Codes plus the (few) categories, so relabelled categories count as a change
+        values = pd.util.hash_array(series.cat.codes.to_numpy())
+        categories = int(pd.util.hash_array(np.asarray(series.cat.categories, dtype=object)).sum())
+    else:
+        # Period/datetime arrays expose their int64 ordinals; everything else hashes its values
+        array = series.array
+        values = pd.util.hash_array(array.asi8 if hasattr(array, 'asi8') else np.asarray(series.to_numpy()))
+        categories = 0
+    # Position-weighted, so reordered rows change the checksum too
+    weights = np.arange(1, len(values) + 1, dtype=np.uint64)
+    return int((values * weights).sum()), categories
+
+
+def frame_version(df):
+    # Cheap content checksum of a frame: changes when the frame is replaced or edited in place
+    # (df['Category'] = ..., df.loc[rows, 'Amount'] = ...). A few ms per column per million rows.
+    return id(df), tuple(df.columns), tuple(_column_checksum(df[column]) for column in df.columns)
+
+
+class TransactionIndex:
+    # Read-only query layer over a standardized transaction frame. The frame is sorted by
+    # Date once, so date ranges are binary searches; categories map to sorted row positions;
+    # filters narrow a position array and rows are only materialized by the final take.
+    def __init__(self, df):
+        if not df['Date'].is_monotonic_increasing:
+            df = df.sort_values('Date', kind='stable')
+        self.df = df
+        self._amounts = df['Amount'].to_numpy()
+        self._category_positions = None
+
+    def category_positions(self):
+        if self._category_positions is None:
+            groups = self.df.groupby('Category', observed=True, sort=False).indices
+            self._category_positions = {str(category): positions for category, positions in groups.items()}
+        return self._category_positions
+
+    def positions(self, start_date=None, end_date=None, categories=None, min_amount=None, max_amount=None,
+                  contains=None):
+        lo, hi = date_bounds(self.df['Date'], start_date, end_date)
+        if categories is None:
+            positions = np.arange(lo, hi)
+        else:
+            if isinstance(categories, str):
+                categories = [categories]
+            index = self.category_positions()
+            found = [index[category] for category in categories if category in index]
+            positions = np.sort(np.concatenate(found)) if found else np.array([], dtype=np.intp)
+            positions = positions[np.searchsorted(positions, lo):np.searchsorted(positions, hi)]
+
+        if min_amount is not None:
+            positions = positions[self._amounts[positions] >= min_amount]
+        if max_amount is not None:
+            positions = positions[self._amounts[positions] <= max_amount]
+        if contains is not None:
+            positions = positions[self._description_matches(positions, contains)]
+        return positions
+
+    def _description_matches(self, positions, text):
+        descriptions = self.df['Description']
+        if isinstance(descriptions.dtype, pd.CategoricalDtype):
+            # Match each distinct description once, then look rows up by code
+            matching = descriptions.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+            codes = descriptions.cat.codes.to_numpy()[positions]
+            return (codes >= 0) & np.asarray(matching)[codes]
+        return descriptions.iloc[positions].astype(str).str.contains(text, case=False, regex=False).to_numpy()
+
+    def query(self, **filters):
+        return self.df.iloc[self.positions(**filters)]
+
+    def top_expenses(self, k=5, **filters):
+        # The k largest expenses (most negative amounts) without sorting every row
+        positions = self.positions(**filters)
+        positions = positions[self._amounts[positions] < 0]
+        if k <= 0:
+            positions = positions[:0]
+        elif len(positions) > k:
+            positions = positions[np.argpartition(self._amounts[positions], k - 1)[:k]]
+        order = np.argsort(self._amounts[positions], kind='stable')
+        return self.df.iloc[positions[order]]
@@ -0,0 +1,144 @@
+# src/recurring.py
+
+import re
+import numpy as np
+import pandas as pd
+from src.category_cache import normalize_descriptions
+
+# Cadence: (typical gap in days, allowed deviation in days, charges per year)
+CADENCES = {
+    'weekly': (7.0, 1.0, 52.0),
+    'monthly': (30.44, 3.5, 12.0),
+    'yearly': (365.25, 10.0, 1.0),
+}
+# Calendar step to the next expected charge
+CADENCE_STEPS = {
+    'weekly': pd.DateOffset(weeks=1),
+    'monthly': pd.DateOffset(months=1),
+    'yearly': pd.DateOffset(years=1),
+}
+# Monthly charges at least this large are labelled Rent, everything else Subscriptions
+RENT_MIN_AMOUNT = 300.0
+
+_DIGITS = re.compile(r'\d+')
+_SPACES = re.compile(r'\s+')
+
+CHARGE_COLUMNS = ['Description', 'Banks', 'Cadence', 'Category', 'Occurrences', 'Mean_Amount', 'Annual_Cost',
+                  'First_Date', 'Last_Date', 'Next_Expected']
+
+
+def merchant_keys(descriptions):
+    # Normalized description without digit runs (order numbers, dates, card suffixes)
+    keys = normalize_descriptions(descriptions).str.replace(_DIGITS, '', regex=True)
+    return keys.str.replace(_SPACES, ' ', regex=True).str.strip()
+
+
+def _map_distinct(func, values):
+    # Apply a string transform once per distinct value and scatter the result back to every row
+    codes, uniques = pd.factorize(values)
+    return func(pd.Series(uniques, dtype=object)).to_numpy()[codes]
+
+
+def detect_recurring(df, amount_tolerance=0.1, min_occurrences=3, min_regularity=0.75):
+    # Finds expenses that repeat on a weekly, monthly or yearly cadence, across every bank in df.
+    # Returns (charges, series): one row per recurring charge, and the charge id of every row of
+    # df (-1 for rows that are not part of one). Two sorts and a few grouped reductions, so the
+    # cost grows as n log n in the number of rows.
+    is_expense = ((df['Amount'] < 0) & df['Date'].notna()).to_numpy()
+    expenses = df[is_expense]
+    codes, _ = pd.factorize(_map_distinct(merchant_keys, expenses['Description']))
+    amounts = -expenses['Amount'].to_numpy(dtype=float)
+    days = (expenses['Date'].to_numpy(dtype='datetime64[s]').astype('int64') / 86400.0)
+
+    # Same merchant, amounts within amount_tolerance of their sorted neighbour -> one candidate series
+    order = np.lexsort((amounts, codes))
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (codes[order][1:] != codes[order][:-1]) | \
+                 (np.diff(amounts[order]) > amount_tolerance * amounts[order][:-1])
+    candidate = np.empty(len(order), dtype=np.int64)
+    candidate[order] = np.cumsum(starts) - 1
+    n_candidates = int(candidate.max()) + 1 if len(candidate) else 0
+
+    # Gaps between consecutive charges of each candidate
+    order = np.lexsort((days, candidate))
+    same = candidate[order][1:] == candidate[order][:-1]
+    gap_owner = candidate[order][1:][same]
+    gaps = np.diff(days[order])[same]
+    median_gap = pd.Series(gaps).groupby(gap_owner).median().reindex(range(n_candidates)).to_numpy()
+
+    # Cadence whose window holds the median gap, then the share of gaps that fall in that window
+    periods = np.array([period for period, _, _ in CADENCES.values()])
+    slack = np.array([deviation for _, deviation, _ in CADENCES.values()])
+    fits = np.abs(median_gap[:, None] - periods[None, :]) <= slack[None, :]
+    cadence = np.where(fits.any(axis=1), fits.argmax(axis=1), -1)
+    on_time = np.abs(gaps - periods[cadence[gap_owner]]) <= slack[cadence[gap_owner]]
+    n_gaps = np.bincount(gap_owner, minlength=n_candidates)
+    regularity = np.bincount(gap_owner, weights=on_time, minlength=n_candidates) / np.maximum(n_gaps, 1)
+    recurring = (cadence >= 0) & (n_gaps + 1 >= min_occurrences) & (regularity >= min_regularity)
+
+    # Renumber the recurring candidates 0..k-1 and map every row of df to its charge
+    charge_ids = np.where(recurring, np.cumsum(recurring) - 1, -1)
+    series = np.full(len(df), -1, dtype=np.int64)
+    series[is_expense] = charge_ids[candidate]
+    return _charges_table(expenses, series[is_expense], cadence[recurring]), pd.Series(series, index=df.index)
+
+
+def _charges_table(expenses, charge_ids, cadence):
+    rows = expenses[charge_ids >= 0].assign(Charge=charge_ids[charge_ids >= 0])
+    if rows.empty:
+        return pd.DataFrame(columns=CHARGE_COLUMNS)
+    rows = rows.sort_values('Date', kind='stable')
+    grouped = rows.groupby('Charge')
+    charges = pd.DataFrame({
+        'Description': grouped['Description'].last().astype(str).str.strip(),
+        'Banks': grouped['Bank'].unique().map(lambda banks: ', '.join(sorted(map(str, banks)))),
+        'Occurrences': grouped.size(),
+        'Mean_Amount': -grouped['Amount'].mean(),
+        'First_Date': grouped['Date'].min(),
+        'Last_Date': grouped['Date'].max(),
+    })
+    names = np.array(list(CADENCES))[cadence]
+    charges['Cadence'] = names
+    charges['Category'] = np.where((names == 'monthly') & (charges['Mean_Amount'] >= RENT_MIN_AMOUNT),
+                                   'Rent', 'Subscriptions')
+    charges['Annual_Cost'] = charges['Mean_Amount'] * np.array([CADENCES[name][2] for name in names])
+    charges['Next_Expected'] = charges['Last_Date']
+    for name, step in CADENCE_STEPS.items():
+        charges.loc[names == name, 'Next_Expected'] += step
+    return charges[CHARGE_COLUMNS].rename_axis('Charge').reset_index()
+
+
+def recurring_labels(df, charges, series, min_share=0.5):
+    # description key (as used by BaseBank.categorize) -> category, for keys whose expense rows
+    # mostly belong to recurring charges
+    is_expense = (df['Amount'] < 0).to_numpy()
+    if not is_expense.any() or charges.empty:
+        return {}
+    keys = _map_distinct(normalize_descriptions, df['Description'][is_expense])
+    categories = charges.set_index('Charge')['Category'].reindex(series.to_numpy()[is_expense]).to_numpy()
+    frame = pd.DataFrame({'Key': keys, 'Category': categories})
+    share = frame['Category'].notna().groupby(frame['Key']).mean()
+    top = frame.dropna().groupby('Key')['Category'].agg(lambda c: c.value_counts().index[0])
+    return top[share.reindex(top.index) >= min_share].to_dict()
+
+
+class RecurringCategorizer:
+    # Categorizer tier: expenses whose description belongs to a detected recurring charge are
+    # labelled Subscriptions or Rent before the cache and the model are consulted. It runs after
+    # the rules, so merchant rules keep their category, but it relabels rows the generic rules
+    # called a Transfer: rent paid by Bizum or bank transfer ends up as Rent.
+    name = 'recurring'
+    expenses_only = True
+    overrides = ('Transfer',)
+
+    def __init__(self, labels, charges=None):
+        self.labels = dict(labels)
+        self.charges = charges if charges is not None else pd.DataFrame(columns=['Charge'] + CHARGE_COLUMNS)
+
+    @classmethod
+    def from_transactions(cls, df, **kwargs):
+        charges, series = detect_recurring(df, **kwargs)
+        return cls(recurring_labels(df, charges, series), charges)
+
+    def categorize(self, descriptions):
+        return [self.labels.get(description) for description in descriptions]
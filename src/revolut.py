@@ -12,7 +12,7 @@ class Revolut(BaseBank):
         df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
         df['Balance'] = pd.to_numeric(df['Balance'], errors='coerce')
         df.dropna(subset=['Date', 'Amount', 'Balance'], inplace=True)
-        df.sort_values('Date', inplace=True)
+        df.sort_values('Date', inplace=True, kind='stable')
 
         df['Bank'] = 'Revolut'
         
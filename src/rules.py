@@ -0,0 +1,87 @@
+# src/rules.py
+
+import csv
+import re
+import threading
+
+DEFAULT_RULES_PATH = 'config/category_rules.csv'
+FLAGS = re.IGNORECASE | re.DOTALL
+# Backreferences, named groups and conditionals refer to group numbers or names, which change
+# once a rule is wrapped into the combined pattern; such rules are matched on their own
+_GROUP_REFERENCES = re.compile(r'\\[1-9]|\\g<|\(\?P[<=]|\(\?\(')
+
+
+def read_rules(path):
+    # Rules file: CSV with a `pattern,category` header; blank lines and `#` comments are skipped
+    with open(path, newline='', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip() and not line.lstrip().startswith('#')]
+    return [(row['pattern'], row['category'].strip()) for row in csv.DictReader(lines)]
+
+
+def _compile_rule(pattern, category):
+    try:
+        return re.compile(pattern, FLAGS)
+    except re.error as e:
+        raise ValueError(f"Invalid rule pattern {pattern!r} for category {category!r}: {e}") from None
+
+
+def _combine(rules):
+    # One pattern for consecutive rules: tried in file order, so the first matching rule wins
+    alternatives = '|'.join(f'.*?(?P<r{i}>{pattern})' for i, pattern in rules)
+    return re.compile(f'^(?:{alternatives})', FLAGS)
+
+
+class RuleCategorizer:
+    name = 'rules'
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.categories = [category for _, category in self.rules]
+        # Runs of combinable rules share one pattern; a rule with group references gets its own
+        # pattern. Either way the runs are tried in file order.
+        self.patterns = []
+        run = []
+        for i, (pattern, category) in enumerate(self.rules):
+            compiled = _compile_rule(pattern, category)
+            if _GROUP_REFERENCES.search(pattern) is None:
+                run.append((i, pattern))
+                continue
+            if run:
+                self.patterns.append((None, _combine(run)))
+                run = []
+            self.patterns.append((i, compiled))
+        if run:
+            self.patterns.append((None, _combine(run)))
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(read_rules(path))
+
+    def match(self, description):
+        for rule, pattern in self.patterns:
+            if rule is None:
+                m = pattern.match(description)
+                if m is not None:
+                    return self.categories[int(m.lastgroup[1:])]
+            elif pattern.search(description) is not None:
+                return self.categories[rule]
+        return None
+
+    def categorize(self, descriptions):
+        return [self.match(description) for description in descriptions]
+
+
+_rule_sets = {}
+_lock = threading.Lock()
+
+
+def get_rule_categorizer(path=DEFAULT_RULES_PATH):
+    with _lock:
+        if path not in _rule_sets:
+            _rule_sets[path] = RuleCategorizer.from_file(path)
+        return _rule_sets[path]
+
+
+def clear_rule_categorizers():
+    with _lock:
+        _rule_sets.clear()
@@ -0,0 +1,36 @@
+# src/schema.py
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Columns with few distinct values per bank: stored once per value, one small integer code per row.
+# Amount and Balance stay float64: float32 cannot hold cents exactly beyond ~167k and its sums drift.
+CATEGORICAL_COLUMNS = ['Description', 'Bank', 'Category', 'Category_Source']
+FLOAT_COLUMNS = ['Amount', 'Balance']
+
+
+def compact_transactions(df):
+    # Enforce the standardized in-memory schema on a bank frame, in place
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    for column in FLOAT_COLUMNS:
+        if column in df.columns and df[column].dtype != 'float64':
+            df[column] = df[column].astype('float64')
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    return df
+
+
+def combine_transactions(frames):
+    # Concatenate bank frames; categorical columns are merged through union_categoricals
+    # so only their integer codes are copied instead of materializing every string.
+    frames = [df for df in frames if df is not None]
+    if not frames:
+        return pd.DataFrame()
+    categorical = [column for column in frames[0].columns
+                   if all(column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype) for df in frames)]
+    combined = pd.concat([df.drop(columns=categorical) for df in frames], ignore_index=True)
+    for column in categorical:
+        combined[column] = union_categoricals([df[column] for df in frames], ignore_order=True)
+    return combined[[column for column in frames[0].columns if column in combined.columns]]
@@ -0,0 +1,96 @@
+# src/store.py
+
+import os
+import shutil
+import pandas as pd
+from src.schema import compact_transactions
+
+TRANSACTIONS = 'transactions'
+METRICS = 'metrics'
+PARTITION_COLUMNS = ['Bank', 'YearMonth']
+CATEGORICAL_COLUMNS = ['Bank', 'Category', 'Category_Source']
+
+
+def _to_store(df, bank_name):
+    # Typed columns for Parquet; partition keys must be plain strings
+    df = df.copy()
+    df['Bank'] = bank_name
+    df['YearMonth'] = df['Date'].dt.to_period('M').astype(str)
+    df['Amount'] = df['Amount'].astype('float64')
+    df['Balance'] = df['Balance'].astype('float64')
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and column != 'Bank':
+            df[column] = df[column].astype('category')
+    return df
+
+
+def _from_store(df):
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            categories = df[column].astype('category')
+            df[column] = categories.cat.rename_categories(categories.cat.categories.astype(str))
+    if 'YearMonth' in df.columns and 'Date' in df.columns:
+        df['YearMonth'] = df['Date'].dt.to_period('M')
+    elif 'YearMonth' in df.columns:
+        df['YearMonth'] = pd.PeriodIndex(df['YearMonth'].astype(str), freq='M')
+    return compact_transactions(df)
+
+
+def _month_filters(bank_names, start_date, end_date):
+    filters = []
+    if bank_names is not None:
+        filters.append(('Bank', 'in', list(bank_names)))
+    if start_date is not None:
+        filters.append(('YearMonth', '>=', str(pd.Timestamp(start_date).to_period('M'))))
+    if end_date is not None:
+        filters.append(('YearMonth', '<=', str(pd.Timestamp(end_date).to_period('M'))))
+    return filters or None
+
+
+def write_transactions(df, store_folder, bank_name):
+    # Replaces everything stored for bank_name with df, one file per Bank/YearMonth partition
+    root = os.path.join(store_folder, TRANSACTIONS)
+    shutil.rmtree(os.path.join(root, f"Bank={bank_name}"), ignore_errors=True)
+    _to_store(df, bank_name).to_parquet(root, partition_cols=PARTITION_COLUMNS, index=False)
+
+
+def read_transactions(store_folder, bank_names=None, start_date=None, end_date=None, columns=None):
+    # Only the partitions overlapping [start_date, end_date] and the requested columns are read
+    root = os.path.join(store_folder, TRANSACTIONS)
+    if columns is not None:
+        columns = list(dict.fromkeys(['Date', *columns]))
+    df = pd.read_parquet(root, columns=columns, filters=_month_filters(bank_names, start_date, end_date))
+    if start_date is not None:
+        df = df[df['Date'] >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        df = df[df['Date'] <= pd.Timestamp(end_date)]
+    return _from_store(df.sort_values('Date', kind='stable').reset_index(drop=True))
+
+
+def write_metrics(df, store_folder, bank_name):
+    folder = os.path.join(store_folder, METRICS)
+    os.makedirs(folder, exist_ok=True)
+    df = df.copy()
+    df['YearMonth'] = df['YearMonth'].astype(str)
+    df.to_parquet(os.path.join(folder, f"{bank_name}.parquet"), index=False)
+
+
+def read_metrics(store_folder, bank_name):
+    df = pd.read_parquet(os.path.join(store_folder, METRICS, f"{bank_name}.parquet"))
+    return _from_store(df)
+
+
+def has_transactions(store_folder, bank_name):
+    return os.path.isdir(os.path.join(store_folder, TRANSACTIONS, f"Bank={bank_name}"))
+
+
+def load_banks_from_store(banks, store_folder, start_date=None, end_date=None, columns=None):
+    # Fill bank.df straight from the store so parse_csv/to_standard are skipped entirely.
+    # Banks the store holds nothing for keep bank.df = None and are parsed from their export.
+    for bank in banks:
+        if not has_transactions(store_folder, bank.name):
+            print(f"{bank.name}: not in {store_folder}, parsing {bank.csv_path}")
+            bank.df = None
+            continue
+        bank.df = read_transactions(store_folder, [bank.name], start_date, end_date, columns)
+    return banks
@@ -0,0 +1,99 @@
+# src/timeline.py
+
+import numpy as np
+import pandas as pd
+
+
+def end_of_day_balances(df):
+    # Closing balance of every day with transactions; the bank frame is sorted by Date
+    rows = df.dropna(subset=['Date', 'Balance'])
+    return rows.groupby(rows['Date'].dt.normalize())['Balance'].last()
+
+
+def opening_balance(df):
+    # What the account held before its first transaction in the export
+    rows = df.dropna(subset=['Date', 'Balance'])
+    if rows.empty:
+        return np.nan
+    first = rows.iloc[0]
+    amount = first['Amount'] if 'Amount' in rows.columns and pd.notna(first['Amount']) else 0.0
+    return first['Balance'] - amount
+
+
+class BalanceTimeline:
+    # Daily balances of several banks aligned on one union index. Before a bank's
+    # first transaction it holds its opening balance, after its last one it keeps its
+    # final balance, so the total never has gaps where date ranges differ.
+    def __init__(self, names, frames):
+        self.names = list(names)
+        self.openings = [opening_balance(df) for df in frames]
+        closing = [end_of_day_balances(df) for df in frames]
+        days = [series.index for series in closing if not series.empty]
+        if days:
+            start = min(index[0] for index in days)
+            end = max(index[-1] for index in days)
+            index = pd.date_range(start, end, freq='D')
+        else:
+            index = pd.DatetimeIndex([], freq='D')
+
+        columns = {}
+        for i, series in enumerate(closing):
+            columns[i] = series.reindex(index).ffill().fillna(self.openings[i])
+        self.balances = pd.DataFrame(columns, index=index)
+        self.balances.columns = self.names
+
+    @classmethod
+    def from_banks(cls, banks):
+        return cls([bank.name for bank in banks], [bank.df for bank in banks])
+
+    @property
+    def index(self):
+        return self.balances.index
+
+    def bank(self, i):
+        return self.balances.iloc[:, i]
+
+    def total(self):
+        return self.balances.sum(axis=1, min_count=1).rename('Total Balance')
+
+    def balance_on(self, date, bank=None):
+        # Balance at the end of `date`: the total over every bank, or one bank by position
+        position = self.index.searchsorted(pd.Timestamp(date).normalize(), side='right') - 1
+        if position < 0:
+            openings = self.openings if bank is None else [self.openings[bank]]
+            return sum(opening for opening in openings if pd.notna(opening))
+        series = self.total() if bank is None else self.bank(bank)
+        return series.iloc[position]
+
+
+def downsample_minmax(series, max_points=2000):
+    # Keeps the minimum and maximum of each bucket so spikes survive long ranges
+    if len(series) <= max_points:
+        return series
+    buckets = np.arange(len(series)) * (max_points // 2) // len(series)
+    values = series.to_numpy()
+    grouped = pd.Series(values).groupby(buckets)
+    positions = np.unique(np.concatenate([grouped.idxmin().dropna().to_numpy(), grouped.idxmax().dropna().to_numpy()]).astype(int))
+    return series.iloc[positions]
+
+
+def downsample_lttb(series, max_points=2000):
+    # Largest-Triangle-Three-Buckets: keeps the points that best preserve the line's shape
+    n = len(series)
+    if n <= max_points or max_points < 3:
+        return series
+    x = series.index.asi8.astype(float) if isinstance(series.index, pd.DatetimeIndex) else np.arange(n, dtype=float)
+    y = series.to_numpy(dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = [0]
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected.append(a)
+    selected.append(n - 1)
+    return series.iloc[selected]
@@ -21,3 +21,44 @@ def test_calculate_metrics():
     metrics = bank.calculate_metrics()
     assert 'Total_Income' in metrics.columns
     assert 'Total_Expense' in metrics.columns
+
+class RecordingClassifier:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, descriptions, candidate_labels):
+        self.batches.append(list(descriptions))
+        return [{'labels': ['Groceries' if 'mercadona' in d.lower() else 'Other']} for d in descriptions]
+
+def test_categorize_expenses_classifies_unique_descriptions_once():
+    bank = MockBank("MockBank", "mock.csv")
+    bank.classifier = RecordingClassifier()
+    bank.df = pd.DataFrame({'Description': ["Supermercado Mercadona", "BIZUM DE PEPE", "supermercado  MERCADONA ",
+                                            "Supermercado Mercadona", "Netflix"]})
+    bank.categorize_expenses()
+
+    assert bank.classifier.batches == [["Netflix", "BIZUM DE PEPE", "Supermercado Mercadona"]]
+    assert list(bank.df['Category']) == ["Groceries", "Other", "Groceries", "Groceries", "Other"]
+
+def test_query_index_follows_in_place_edits():
+    from src.schema import compact_transactions
+    bank = MockBank("MockBank", "mock.csv")
+    bank.df = compact_transactions(pd.DataFrame({
+        'Date': pd.to_datetime(['2024-06-03', '2024-06-01', '2024-06-10']),
+        'Amount': [-50.0, -800.0, -120.0],
+        'Balance': [950.0, 1000.0, 830.0],
+        'Description': ['Mercadona', 'Alquiler', 'IKEA'],
+        'Category': ['Groceries', 'Other', 'Other'],
+    }))
+    index = bank.transactions()
+    assert bank.transactions() is index
+    assert len(index.query(categories='Rent')) == 0
+
+    bank.df['Category'] = ['Groceries', 'Rent', 'Rent']
+    assert len(bank.transactions().query(categories='Rent')) == 2
+
+    bank.df.loc[bank.df['Description'] == 'IKEA', 'Category'] = 'Groceries'
+    assert len(bank.transactions().query(categories='Rent')) == 1
+
+    bank.df.loc[bank.df['Description'] == 'Mercadona', 'Amount'] = -5.0
+    assert bank.transactions().query(max_amount=-100)['Description'].tolist() == ['Alquiler', 'IKEA']
@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+from src.base_bank import BaseBank
+from src.category_cache import CategoryCache, clear_category_caches, normalize_description
+
+LABELS = ["Groceries", "Other"]
+
+
+class MockBank(BaseBank):
+    def parse_csv(self):
+        pass
+
+
+class CountingClassifier:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, descriptions, candidate_labels):
+        self.seen.extend(descriptions)
+        return [{'labels': ['Groceries' if 'mercadona' in d.lower() else 'Other']} for d in descriptions]
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_category_caches()
+    yield
+    clear_category_caches()
+
+
+def test_normalize_description():
+    assert normalize_description("  Supermercado   MERCADONA ") == "supermercado mercadona"
+
+
+def test_cache_round_trip(tmpdir):
+    path = str(tmpdir.join("categories.json"))
+    cache = CategoryCache(path, "model", LABELS)
+    cache.put("mercadona", "Groceries")
+    cache.save()
+
+    reloaded = CategoryCache(path, "model", LABELS)
+    assert reloaded.get("mercadona") == "Groceries"
+    assert reloaded.hits == 1
+
+
+def test_cache_invalidated_when_labels_or_model_change(tmpdir):
+    path = str(tmpdir.join("categories.json"))
+    cache = CategoryCache(path, "model", LABELS)
+    cache.put("mercadona", "Groceries")
+    cache.save()
+
+    assert len(CategoryCache(path, "model", LABELS + ["Rent"])) == 0
+    assert len(CategoryCache(path, "other-model", LABELS)) == 0
+
+
+def test_cache_evicts_least_recently_used(tmpdir):
+    cache = CategoryCache(str(tmpdir.join("categories.json")), "model", LABELS, max_entries=2)
+    cache.put("a", "Other")
+    cache.put("b", "Other")
+    cache.get("a")
+    cache.put("c", "Other")
+    assert cache.get("b") is None
+    assert cache.get("a") == "Other"
+    assert cache.get("c") == "Other"
+
+
+def test_categorize_expenses_only_classifies_unseen(tmpdir):
+    path = str(tmpdir.join("categories.json"))
+    first = MockBank("MockBank", "mock.csv")
+    first.cache_path = path
+    first.classifier = CountingClassifier()
+    first.df = pd.DataFrame({'Description': ["Supermercado Mercadona", "Netflix"]})
+    first.categorize_expenses()
+
+    clear_category_caches()
+    second = MockBank("MockBank", "mock.csv")
+    second.cache_path = path
+    second.classifier = CountingClassifier()
+    second.df = pd.DataFrame({'Description': ["supermercado  mercadona ", "Netflix", "Gym"]})
+    second.categorize_expenses()
+
+    assert second.classifier.seen == ["Gym"]
+    assert list(second.df['Category']) == ["Groceries", "Other", "Other"]
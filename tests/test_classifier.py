@@ -0,0 +1,129 @@
+import pytest
+import pandas as pd
+import src.classifier as classifier_module
+from src.bank_factory import BankFactory
+
+
+class FakePipeline:
+    def __call__(self, descriptions, candidate_labels):
+        if isinstance(descriptions, str):
+            return {'labels': [candidate_labels[0]]}
+        return [{'labels': [candidate_labels[0]]} for _ in descriptions]
+
+
+@pytest.fixture
+def pipeline_calls(monkeypatch):
+    calls = []
+
+    def fake_pipeline(task, model):
+        calls.append((task, model))
+        return FakePipeline()
+
+    classifier_module.clear_classifiers()
+    monkeypatch.setattr(classifier_module, 'pipeline', fake_pipeline)
+    yield calls
+    classifier_module.clear_classifiers()
+
+
+def test_building_banks_does_not_load_model(pipeline_calls):
+    banks = [BankFactory.get_bank('Openbank', 'data/openbank_test.csv') for _ in range(5)]
+    assert len(banks) == 5
+    assert pipeline_calls == []
+    assert not classifier_module.is_loaded()
+
+
+def test_model_is_shared_across_banks(pipeline_calls):
+    openbank = BankFactory.get_bank('Openbank', 'data/openbank_test.csv')
+    revolut = BankFactory.get_bank('Revolut', 'data/revolut_test.csv')
+    for bank in (openbank, revolut):
+        bank.df = pd.DataFrame({'Description': ['Supermercado Mercadona', 'Netflix']})
+        bank.categorize_expenses()
+        assert list(bank.df['Category']) == ['Groceries', 'Groceries']
+
+    assert pipeline_calls == [('zero-shot-classification', classifier_module.DEFAULT_MODEL)]
+    assert openbank.classifier is revolut.classifier
+
+
+class FakeEncoder:
+    # Bag of keywords: one dimension per vocabulary word
+    vocabulary = ['food', 'supermercado', 'groceries', 'netflix', 'subscriptions', 'renfe', 'transport']
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[1.0 if word in text.lower() else 0.0 for word in self.vocabulary] + [0.1] for text in texts]
+
+
+def test_embedding_classifier_ranks_labels_by_similarity():
+    encoder = FakeEncoder()
+    classifier = classifier_module.EmbeddingClassifier(encoder)
+    labels = ['Groceries', 'Subscriptions', 'Transport']
+
+    results = classifier(['Supermercado groceries', 'NETFLIX subscriptions', 'RENFE transport'], labels)
+    assert [result['labels'][0] for result in results] == labels
+    assert results[0]['scores'] == sorted(results[0]['scores'], reverse=True)
+    assert classifier('renfe transport', labels)['labels'][0] == 'Transport'
+
+    # Label embeddings are computed once per label set
+    assert encoder.calls.count(labels) == 1
+
+
+def test_backend_selection(monkeypatch):
+    loaded = []
+    classifier_module.clear_classifiers()
+    monkeypatch.setattr(classifier_module, '_set_torch_threads', lambda threads: None)
+    monkeypatch.setitem(classifier_module._LOADERS, 'embedding',
+                        lambda model, threads: loaded.append((model, threads)) or FakePipeline())
+
+    bank = BankFactory.get_bank('Revolut', 'data/revolut_test.csv')
+    bank.model_name = classifier_module.DEFAULT_EMBEDDING_MODEL
+    bank.backend = 'embedding'
+    bank.threads = 2
+    assert bank.classifier is bank.classifier
+    assert loaded == [(classifier_module.DEFAULT_EMBEDDING_MODEL, 2)]
+    assert classifier_module.is_loaded(classifier_module.DEFAULT_EMBEDDING_MODEL, 'embedding', 2)
+
+    with pytest.raises(ValueError):
+        classifier_module.get_classifier(backend='tpu')
+    classifier_module.clear_classifiers()
+
+
+def test_cache_is_keyed_by_backend():
+    assert classifier_module.classifier_id('m') == 'm'
+    assert classifier_module.classifier_id('m', 'quantized') != classifier_module.classifier_id('m', 'onnx')
+
+
+def test_torch_thread_count_is_process_wide(monkeypatch):
+    tuned = []
+    classifier_module.clear_classifiers()
+    monkeypatch.setattr(classifier_module, '_set_torch_threads', tuned.append)
+    for backend in ('pytorch', 'onnx'):
+        monkeypatch.setitem(classifier_module._LOADERS, backend, lambda model, threads: FakePipeline())
+
+    # One torch classifier whatever the thread count; the last count asked for is applied
+    assert classifier_module.get_classifier('m', 'pytorch', 2) is classifier_module.get_classifier('m', 'pytorch', 4)
+    assert tuned == [2, 4]
+    # ONNX Runtime sessions keep their own thread pool
+    assert classifier_module.get_classifier('m', 'onnx', 2) is not classifier_module.get_classifier('m', 'onnx', 4)
+    assert tuned == [2, 4]
+    classifier_module.clear_classifiers()
+
+
+def test_quantized_pipeline_from_a_tiny_model(tmpdir):
+    pytest.importorskip('transformers')
+    pytest.importorskip('torchao')
+    from benchmarks.synthetic import write_random_model
+    bank = BankFactory.get_bank('Openbank', 'data/openbank_test.csv')
+    descriptions = ['Supermercado Mercadona', 'NETFLIX.COM']
+    path = write_random_model(str(tmpdir.join('nli')), 'nli', descriptions + bank.candidate_labels + ['This example is {}.'],
+                              dim=32, n_layers=1, n_heads=2, hidden_dim=64)
+    classifier_module.clear_classifiers()
+    try:
+        quantized = classifier_module.get_classifier(path, 'quantized')
+        results = quantized(descriptions, bank.candidate_labels)
+    finally:
+        classifier_module.clear_classifiers()
+    assert [sorted(result['labels']) for result in results] == [sorted(bank.candidate_labels)] * 2
+    assert all(sum(result['scores']) == pytest.approx(1.0, abs=1e-3) for result in results)
@@ -0,0 +1,66 @@
+import pytest
+import pandas as pd
+from src.cube import RollupCube
+from src.metrics import period_metrics
+
+def frame(rows):
+    df = pd.DataFrame(rows, columns=['Date', 'Amount', 'Balance', 'Category'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['YearMonth'] = df['Date'].dt.to_period('M')
+    return df
+
+@pytest.fixture
+def openbank():
+    return frame([
+        ('2024-06-01 09:00', 100.0, 1100.0, 'Other'),
+        ('2024-06-01 18:00', -30.0, 1070.0, 'Groceries'),
+        ('2024-06-20 10:00', -20.0, 1050.0, 'Dining'),
+        ('2024-07-02 10:00', -15.0, 1035.0, 'Groceries'),
+        ('2025-01-05 10:00', 500.0, 1535.0, 'Other'),
+    ])
+
+@pytest.fixture
+def revolut():
+    return frame([
+        ('2024-06-05 12:00', -5.0, 95.0, 'Dining'),
+        ('2024-07-10 12:00', 50.0, 145.0, 'Transfer'),
+    ])
+
+@pytest.fixture
+def cube(openbank, revolut):
+    cube = RollupCube()
+    cube.add_bank('Openbank', openbank)
+    cube.add_bank('Revolut', revolut)
+    return cube
+
+@pytest.mark.parametrize('freq', ['D', 'W', 'M', 'Y'])
+def test_bank_metrics_match_period_metrics(cube, openbank, freq):
+    pd.testing.assert_frame_equal(cube.metrics('Openbank', freq), period_metrics(openbank, freq), check_dtype=False)
+
+def test_combined_metrics_sum_banks(cube, openbank, revolut):
+    expected = pd.concat([period_metrics(openbank), period_metrics(revolut)]).groupby('YearMonth').sum().reset_index()
+    pd.testing.assert_frame_equal(cube.metrics(), expected, check_dtype=False)
+
+def test_category_totals(cube):
+    assert cube.category_totals('Openbank').to_dict() == {'Groceries': 45.0, 'Dining': 20.0}
+    assert cube.category_totals().to_dict() == {'Groceries': 45.0, 'Dining': 25.0}
+    assert cube.category_totals(start_date='2024-06-02', end_date='2024-06-30').to_dict() == {'Dining': 25.0}
+
+def test_add_bank_replaces_previous_aggregates(cube, revolut):
+    cube.add_bank('Revolut', revolut.iloc[:1])
+    assert cube.metrics('Revolut')['Total_Income'].sum() == 0.0
+    assert cube.banks == ['Openbank', 'Revolut']
+
+def test_update_days(cube, openbank):
+    edited = openbank.copy()
+    edited.loc[2, ['Amount', 'Balance']] = [-40.0, 1030.0]
+    edited = pd.concat([edited, frame([('2024-07-02 20:00', -5.0, 1030.0, 'Dining')])], ignore_index=True)
+    edited = edited.sort_values('Date', kind='stable', ignore_index=True)
+
+    cube.update_days('Openbank', edited, ['2024-06-20', '2024-07-02'])
+    pd.testing.assert_frame_equal(cube.metrics('Openbank'), period_metrics(edited), check_dtype=False)
+
+def test_save_and_load(tmpdir, cube):
+    path = str(tmpdir.join('cube.pkl'))
+    cube.save(path)
+    pd.testing.assert_frame_equal(RollupCube.load(path).metrics(), cube.metrics())
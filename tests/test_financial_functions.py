@@ -0,0 +1,25 @@
+import pytest
+import pandas as pd
+from src.financial_functions import date_bounds, filter_date_range
+
+@pytest.fixture
+def transactions():
+    return pd.DataFrame({
+        'Date': pd.to_datetime(['2024-06-01 10:00', '2024-06-01 12:00', '2024-07-15 00:00', '2024-08-21 12:00', '2024-09-01 00:00']),
+        'Amount': [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+def test_date_bounds_are_inclusive(transactions):
+    assert date_bounds(transactions['Date'], '2024-06-01 12:00:00', '2024-08-21 12:00:00') == (1, 4)
+    assert date_bounds(transactions['Date']) == (0, 5)
+    assert date_bounds(transactions['Date'], '2025-01-01', '2024-01-01') == (5, 5)
+
+def test_filter_date_range(transactions):
+    filtered = filter_date_range(transactions, start_date="2024-06-01 12:00:00", end_date="2024-08-21 12:00:00")
+    assert list(filtered['Amount']) == [2.0, 3.0, 4.0]
+    assert filter_date_range(transactions) is transactions
+
+def test_filter_date_range_unsorted(transactions):
+    shuffled = transactions.iloc[[3, 0, 4, 2, 1]]
+    filtered = filter_date_range(shuffled, start_date="2024-07-01")
+    assert list(filtered['Amount']) == [4.0, 5.0, 3.0]
@@ -0,0 +1,132 @@
+import itertools
+import os
+import pytest
+import pandas as pd
+from src.base_bank import BaseBank
+from src.cube import RollupCube
+from src.incremental import incremental_update, load_cube, row_fingerprints, save_cube
+from src.metrics import period_metrics
+
+class CsvBank(BaseBank):
+    def parse_csv(self):
+        self.df = pd.read_csv(self.csv_path, parse_dates=['Date'])
+
+class RecordingClassifier:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, descriptions, candidate_labels):
+        self.seen.extend(descriptions)
+        return [{'labels': ['Other']} for _ in descriptions]
+
+ROWS = [
+    ('2024-06-01', 100.0, 1000.0, 'Salary'),
+    ('2024-06-15', -50.0, 950.0, 'Mercadona'),
+    ('2024-07-01', -20.0, 930.0, 'Netflix'),
+]
+
+_writes = itertools.count()
+
+def write_export(path, rows):
+    pd.DataFrame(rows, columns=['Date', 'Amount', 'Balance', 'Description']).to_csv(path, index=False)
+    # Make sure the size/mtime signature changes between writes in the same second
+    mtime = 1_700_000_000 + next(_writes)
+    os.utime(path, (mtime, mtime))
+
+def run(csv_path, state_folder, categorize=True, cube=None):
+    bank = CsvBank("Mock", csv_path)
+    bank.classifier = RecordingClassifier()
+    metrics = incremental_update(bank, state_folder, categorize=categorize, cube=cube)
+    return bank, metrics
+
+def test_fingerprints_distinguish_duplicate_rows():
+    df = pd.DataFrame([ROWS[0], ROWS[0]], columns=['Date', 'Amount', 'Balance', 'Description'])
+    fingerprints = row_fingerprints(df)
+    assert fingerprints.nunique() == 2
+
+def test_only_new_rows_are_categorized(tmpdir):
+    csv_path = str(tmpdir.join("export.csv"))
+    state_folder = str(tmpdir.join("state"))
+    write_export(csv_path, ROWS[:2])
+    first, _ = run(csv_path, state_folder)
+    assert first.classifier.seen == ['Salary', 'Mercadona']
+
+    write_export(csv_path, ROWS)
+    second, metrics = run(csv_path, state_folder)
+    assert second.classifier.seen == ['Netflix']
+    assert list(second.df['Category']) == ['Other'] * 3
+    pd.testing.assert_frame_equal(metrics, period_metrics(second.df))
+
+def test_uncategorized_rows_are_categorized_by_a_later_run(tmpdir):
+    csv_path = str(tmpdir.join("export.csv"))
+    state_folder = str(tmpdir.join("state"))
+    write_export(csv_path, ROWS)
+    first, _ = run(csv_path, state_folder, categorize=False)
+    assert first.classifier.seen == []
+    assert first.df['Category'].isna().all()
+
+    # Same export: nothing to re-aggregate, but the missing categories are filled in
+    second, _ = run(csv_path, state_folder)
+    assert sorted(second.classifier.seen) == ['Mercadona', 'Netflix', 'Salary']
+    third, _ = run(csv_path, state_folder)
+    assert third.classifier.seen == []
+    assert list(third.df['Category']) == ['Other'] * 3
+
+def test_changed_history_recomputes_its_month(tmpdir):
+    csv_path = str(tmpdir.join("export.csv"))
+    state_folder = str(tmpdir.join("state"))
+    write_export(csv_path, ROWS)
+    run(csv_path, state_folder)
+
+    edited = [ROWS[0], ('2024-06-15', -60.0, 940.0, 'Mercadona'), ('2024-07-01', -20.0, 920.0, 'Netflix')]
+    write_export(csv_path, edited)
+    bank, metrics = run(csv_path, state_folder)
+    assert sorted(bank.classifier.seen) == ['Mercadona', 'Netflix']
+    assert list(metrics['Total_Expense']) == [60.0, 20.0]
+    pd.testing.assert_frame_equal(metrics, period_metrics(bank.df))
+
+def test_unchanged_file_is_not_parsed_again(tmpdir):
+    csv_path = str(tmpdir.join("export.csv"))
+    state_folder = str(tmpdir.join("state"))
+    write_export(csv_path, ROWS)
+    _, first_metrics = run(csv_path, state_folder)
+
+    bank, metrics = run(csv_path, state_folder)
+    assert bank.classifier.seen == []
+    assert list(bank.df['Description']) == ['Salary', 'Mercadona', 'Netflix']
+    pd.testing.assert_frame_equal(metrics, first_metrics)
+
+def test_saved_cube_only_recomputes_touched_days(tmpdir, monkeypatch):
+    csv_path = str(tmpdir.join("export.csv"))
+    state_folder = str(tmpdir.join("state"))
+    write_export(csv_path, ROWS[:2])
+    cube = load_cube(state_folder)
+    run(csv_path, state_folder, cube=cube)
+    save_cube(cube, state_folder)
+
+    updated_days = []
+    monkeypatch.setattr(RollupCube, 'add_bank', lambda *args: pytest.fail("cube rebuilt from scratch"))
+    original = RollupCube.update_days
+    monkeypatch.setattr(RollupCube, 'update_days',
+                        lambda self, name, df, days: updated_days.extend(days) or original(self, name, df, days))
+    write_export(csv_path, ROWS)
+    cube = load_cube(state_folder)
+    bank, _ = run(csv_path, state_folder, cube=cube)
+    assert updated_days == [pd.Timestamp('2024-07-01')]
+
+    monkeypatch.undo()
+    fresh = RollupCube()
+    fresh.add_bank("Mock", bank.df)
+    pd.testing.assert_frame_equal(cube.metrics("Mock"), fresh.metrics("Mock"), check_dtype=False)
+
+def test_cube_for_another_window_is_not_reused(tmpdir):
+    state_folder = str(tmpdir.join("state"))
+    cube = RollupCube()
+    cube.add_bank("Mock", pd.DataFrame(ROWS, columns=['Date', 'Amount', 'Balance', 'Description']).assign(
+        Date=lambda df: pd.to_datetime(df['Date']), Category='Other'))
+    save_cube(cube, state_folder, '2024-06-01', '2024-07-31')
+    assert load_cube(state_folder, '2024-06-01', '2024-08-31').banks == []
+    save_cube(cube, state_folder, '2024-06-01', '2024-07-31')
+    assert load_cube(state_folder, '2024-06-01', '2024-07-31').banks == ["Mock"]
+    # Loading consumes the saved cube, so a run that fails before saving forces a rebuild
+    assert load_cube(state_folder, '2024-06-01', '2024-07-31').banks == []
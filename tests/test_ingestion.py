@@ -0,0 +1,35 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from src.bank_factory import BankFactory
+from src.ingestion import categorize_standardized, standardize_file
+
+class FakeClassifier:
+    def __call__(self, descriptions, candidate_labels):
+        return [{'labels': ['Other']} for _ in descriptions]
+
+def make_banks():
+    banks = [BankFactory.get_bank('Openbank', 'data/openbank_test.csv'),
+             BankFactory.get_bank('Revolut', 'data/revolut_test.csv'),
+             BankFactory.get_bank('Openbank', 'data/openbank_test.csv')]
+    for bank in banks:
+        bank.classifier = FakeClassifier()
+    return banks
+
+def test_standardize_file_in_spawned_workers_matches_sequential():
+    sequential = make_banks()
+    for bank in sequential:
+        bank.to_standard()
+
+    parallel = make_banks()
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = executor.map(standardize_file, [type(bank) for bank in parallel], [bank.name for bank in parallel],
+                               [bank.csv_path for bank in parallel], [True] * len(parallel))
+        for bank, (df, stages) in zip(parallel, results):
+            bank.df = df
+            categorize_standardized(bank)
+            assert [stage['stage'] for stage in stages] == ['parse_csv', 'to_standard']
+
+    for expected, bank in zip(sequential, parallel):
+        assert bank.df.equals(expected.df)
+        assert (bank.df['Category'] == 'Other').all()
@@ -26,3 +26,92 @@ def test_compute_summary_stats():
     assert summary_stats["Value"][1] == 500
     assert summary_stats["Value"][2] == 500
     assert summary_stats["Value"][3] == 0.5
+
+class FakeClassifier:
+    def __call__(self, descriptions, candidate_labels):
+        return [{'labels': ['Other']} for _ in descriptions]
+
+def synthetic_banks(tmpdir):
+    from benchmarks.synthetic import write_export
+    from src.bank_factory import BankFactory
+    banks = []
+    for i, name in enumerate(['Openbank', 'Revolut']):
+        path = str(tmpdir.join(f"{name}.csv"))
+        if not tmpdir.join(f"{name}.csv").check():
+            write_export(name, path, 2000, seed=i, start='2024-01-01', end='2024-07-31')
+        bank = BankFactory.get_bank(name, path)
+        bank.classifier = FakeClassifier()
+        banks.append(bank)
+    return banks
+
+@pytest.fixture
+def window(tmpdir, monkeypatch):
+    import main
+    # Both bounds cut a month in half
+    monkeypatch.setattr(main, 'START_DATE', '2024-02-10 12:00:00')
+    monkeypatch.setattr(main, 'END_DATE', '2024-05-20 12:00:00')
+    monkeypatch.setattr(main, 'RESULTS_FOLDER', str(tmpdir.join('results')) + '/')
+
+def test_incremental_matches_full_run(tmpdir, window):
+    import main
+    import pandas as pd
+    from src.cube import RollupCube
+    from src.incremental import load_cube, save_cube
+    full_cube = RollupCube()
+    full = calculate_totals(synthetic_banks(tmpdir), cube=full_cube)
+    state_folder = str(tmpdir.join('state'))
+    for _ in range(2):
+        # Second pass reuses the stored state and the cube saved by the first one
+        incremental_cube = load_cube(state_folder, main.START_DATE, main.END_DATE)
+        incremental = calculate_totals(synthetic_banks(tmpdir), state_folder=state_folder, cube=incremental_cube)
+        save_cube(incremental_cube, state_folder, main.START_DATE, main.END_DATE)
+
+        assert incremental[:4] == pytest.approx(full[:4])
+        for expected, actual in zip(full[4], incremental[4]):
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(incremental_cube.metrics(), full_cube.metrics(), check_dtype=False)
+        pd.testing.assert_series_equal(incremental_cube.category_totals(), full_cube.category_totals())
+
+def test_unreadable_banks_are_skipped(tmpdir, window):
+    for state_folder in (None, str(tmpdir.join('state'))):
+        banks = synthetic_banks(tmpdir)
+        banks[0].csv_path = str(tmpdir.join('missing.csv'))
+        totals = calculate_totals(banks, state_folder=state_folder)
+        assert len(totals[4]) == 1
+        assert totals[1] > 0
+
+def test_stream_totals_match_full_run(tmpdir, window):
+    import main
+    import pandas as pd
+    from src.cube import RollupCube
+    from src.metrics import periods_between
+    cube = RollupCube()
+    full = calculate_totals(synthetic_banks(tmpdir), cube=cube)
+    streamed = main.stream_totals(synthetic_banks(tmpdir), chunksize=97)
+
+    assert streamed[:4] == pytest.approx(full[:4])
+    for expected, actual in zip(full[4], streamed[4]):
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(periods_between(main.combine_metrics(streamed[4]), main.START_DATE, main.END_DATE),
+                                  periods_between(cube.metrics(), main.START_DATE, main.END_DATE), check_dtype=False)
+
+    banks = synthetic_banks(tmpdir)
+    banks[0].csv_path = str(tmpdir.join('missing.csv'))
+    assert len(main.stream_totals(banks)[4]) == 1
+
+def test_from_store_with_a_partial_store(tmpdir, window):
+    from src.store import load_banks_from_store, write_transactions
+    store = str(tmpdir.join('store'))
+    stored = synthetic_banks(tmpdir)
+    stored[0].to_standard()
+    write_transactions(stored[0].df, store, 'Openbank')
+    full = calculate_totals(synthetic_banks(tmpdir))
+
+    # Revolut was never stored and is parsed from its export instead
+    banks = load_banks_from_store(synthetic_banks(tmpdir), store)
+    assert calculate_totals(banks)[:4] == pytest.approx(full[:4])
+
+    # Stored rows that all fall outside the window are skipped
+    banks = load_banks_from_store(synthetic_banks(tmpdir), store, '2030-01-01', '2030-12-31')
+    totals = calculate_totals(banks)
+    assert len(totals[4]) == 1
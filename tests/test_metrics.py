@@ -0,0 +1,45 @@
+import pytest
+import pandas as pd
+from src.metrics import period_metrics, streaming_period_metrics
+
+@pytest.fixture
+def transactions():
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-06-01', '2024-06-03', '2024-06-10', '2024-07-02']),
+        'Amount': [100.0, -50.0, -25.0, 200.0],
+        'Balance': [1000.0, 950.0, 925.0, 1125.0],
+    })
+    df['YearMonth'] = df['Date'].dt.to_period('M')
+    return df
+
+def test_monthly_metrics(transactions):
+    metrics = period_metrics(transactions)
+    assert list(metrics.columns) == ['YearMonth', 'Total_Income', 'Total_Expense', 'Balance_Beginning', 'Balance_Ending']
+    assert list(metrics['Total_Income']) == [100.0, 200.0]
+    assert list(metrics['Total_Expense']) == [75.0, 0.0]
+    assert list(metrics['Balance_Beginning']) == [1000.0, 1125.0]
+    assert list(metrics['Balance_Ending']) == [925.0, 1125.0]
+
+def test_metrics_do_not_mutate_input(transactions):
+    columns = list(transactions.columns)
+    period_metrics(transactions)
+    assert list(transactions.columns) == columns
+
+def test_weekly_and_daily_metrics(transactions):
+    weekly = period_metrics(transactions, 'W')
+    assert list(weekly['Total_Expense']) == [0.0, 50.0, 25.0, 0.0]
+    daily = period_metrics(transactions, 'D')
+    assert len(daily) == 4
+    assert 'Day' in daily.columns
+
+def test_unsupported_frequency(transactions):
+    with pytest.raises(ValueError):
+        period_metrics(transactions, 'Q')
+
+def test_streaming_metrics_match_period_metrics(transactions):
+    chunks = [transactions.iloc[2:], transactions.iloc[:1], transactions.iloc[1:2]]
+    for freq in ['M', 'W', 'D']:
+        pd.testing.assert_frame_equal(streaming_period_metrics(chunks, freq), period_metrics(transactions, freq))
+
+def test_streaming_metrics_without_chunks():
+    assert streaming_period_metrics([]).empty
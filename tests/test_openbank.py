@@ -1,9 +1,15 @@
 # tests/test_openbank.py
 
+import json
 import pytest
 import pandas as pd
 from io import StringIO
-from src.openbank import Openbank
+from benchmarks.synthetic import write_openbank_csv
+from src.cube import RollupCube
+from src.incremental import incremental_update
+from src.metrics import period_metrics
+from src.openbank import Openbank, parse_spanish_numbers
+from src.timeline import end_of_day_balances
 
 # Mock data simulating the content of a CSV file based on your example
 mock_csv_data = """;;;;;;;;;
@@ -51,8 +57,78 @@ def test_parse_csv(openbank_instance):
     # Check if the 'Bank' column contains the correct bank name
     assert all(bank.df['Bank'] == "Openbank"), "All entries in the 'Bank' column should be 'Openbank'."
 
-    # Additional checks for correctness of data
-    assert bank.df['Amount'].iloc[0] == 6.50, "The first 'Amount' should be 6.50."
-    assert bank.df['Balance'].iloc[1] == 1760.42, "The second 'Balance' should be 1760.42."
+    # Additional checks for correctness of data; the export lists movements newest first
+    assert bank.df['Amount'].iloc[0] == 13.00, "The first 'Amount' should be 13.00."
+    assert bank.df['Balance'].iloc[1] == 1766.92, "The second 'Balance' should be 1766.92."
     assert bank.df['Date'].iloc[0] == pd.to_datetime("27/12/2023", format="%d/%m/%Y"), "The first 'Date' should be 27/12/2023."
 
+
+def write_large_export(tmpdir, rows):
+    lines = mock_csv_data.splitlines()[:11]
+    balance = 1000.0
+    for i in range(rows):
+        amount = -12.5 if i % 3 else 1250.0
+        balance += amount
+        day = 28 - (i // 20)
+        amount_text = f"{amount:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        balance_text = f"{balance:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        lines.append(f";{day:02d}/12/2023;;{day:02d}/12/2023;;COMPRA {i % 7} ;;{amount_text};;{balance_text}")
+    lines.append(";;;;;;;;;")
+    csv_file = tmpdir.join("openbank_large.csv")
+    csv_file.write("\n".join(lines) + "\n")
+    return str(csv_file)
+
+def test_parse_csv_skips_blank_rows(openbank_instance):
+    bank = openbank_instance
+    bank.parse_csv()
+    assert len(bank.df) == 2
+
+def test_parse_spanish_numbers():
+    values = pd.Series(["1.766,92", "-13,00", "6,50", "garbage"])
+    parsed = parse_spanish_numbers(values)
+    assert list(parsed[:3]) == [1766.92, -13.0, 6.5]
+    assert pd.isna(parsed[3])
+
+def test_streaming_chunks_match_full_parse(tmpdir):
+    csv_path = write_large_export(tmpdir, 200)
+    bank = Openbank("Openbank", csv_path)
+    bank.parse_csv()
+    chunks = list(Openbank("Openbank", csv_path).iter_csv_chunks(chunksize=30))
+
+    assert len(chunks) == 7
+    assert max(len(chunk) for chunk in chunks) <= 30
+    # Chunks come newest first, each in chronological order
+    pd.testing.assert_frame_equal(pd.concat(chunks[::-1], ignore_index=True), bank.df)
+
+def test_stream_metrics_match_calculate_metrics(tmpdir):
+    csv_path = write_large_export(tmpdir, 200)
+    expected = Openbank("Openbank", csv_path)
+    expected.parse_csv()
+    expected.df = expected.df.sort_values('Date', kind='stable')
+    expected.df['YearMonth'] = expected.df['Date'].dt.to_period('M')
+
+    streamed = Openbank("Openbank", csv_path).stream_metrics(freq='W', chunksize=30)
+    pd.testing.assert_frame_equal(streamed, expected.average_metric_per_month('W'))
+    assert streamed['Total_Income'].sum() == 67 * 1250.0
+
+def test_balance_consumers_on_newest_first_export(tmpdir):
+    # Dense synthetic export: many movements share a day, and months straddle chunk boundaries
+    csv_path = str(tmpdir.join("export.csv"))
+    source = write_openbank_csv(csv_path, 3000, start='2024-01-01', end='2024-06-30', seed=4).iloc[::-1]
+    source = source.assign(Date=source['Date'].dt.normalize(), YearMonth=source['Date'].dt.to_period('M'))
+    expected = period_metrics(source)
+
+    bank = Openbank("Openbank", csv_path)
+    bank.to_standard(categorize=False)
+    pd.testing.assert_frame_equal(period_metrics(bank.df), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(Openbank("Openbank", csv_path).stream_metrics(chunksize=97), expected,
+                                  check_dtype=False)
+
+    cube = RollupCube()
+    cube.add_bank("Openbank", bank.df)
+    pd.testing.assert_frame_equal(cube.metrics("Openbank"), expected, check_dtype=False)
+    assert list(end_of_day_balances(bank.df)) == list(source.groupby('Date')['Balance'].last())
+
+    incremental_update(Openbank("Openbank", csv_path), str(tmpdir.join("state")), categorize=False)
+    with open(tmpdir.join("state", "Openbank_export", "state.json")) as f:
+        assert json.load(f)['last_balance'] == source['Balance'].iloc[-1]
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+import pytest
+import main
+from benchmarks.synthetic import write_export
+from src.bank_factory import BankFactory
+from src.pipeline import BackgroundWriter, run_stages
+
+def test_stages_overlap_and_keep_order():
+    events = []
+
+    def stage(name, seconds):
+        async def run(item):
+            events.append(('start', name, item))
+            await asyncio.sleep(seconds)
+            events.append(('end', name, item))
+            return item
+        return run
+
+    asyncio.run(run_stages([1, 2, 3], [stage('parse', 0.01), stage('classify', 0.03), stage('report', 0)]))
+
+    for name in ('parse', 'classify', 'report'):
+        assert [item for kind, stage_name, item in events if kind == 'end' and stage_name == name] == [1, 2, 3]
+    # Item 2 is parsed while item 1 is being classified
+    assert events.index(('start', 'parse', 2)) < events.index(('end', 'classify', 1))
+
+def test_bounded_queues_apply_backpressure():
+    started = []
+    release = asyncio.Event()
+
+    async def parse(item):
+        started.append(item)
+        return item
+
+    async def slow(item):
+        await release.wait()
+        return item
+
+    async def run():
+        pipeline = asyncio.create_task(run_stages(range(10), [parse, slow], queue_size=1))
+        await asyncio.sleep(0.05)
+        # One item in the slow stage, one in the queue, one finished by parse waiting to be queued
+        assert started == [0, 1, 2]
+        release.set()
+        await pipeline
+
+    asyncio.run(run())
+    assert started == list(range(10))
+
+def test_stage_errors_propagate():
+    async def fail(item):
+        if item == 1:
+            raise ValueError("bad bank")
+        return item
+
+    async def passthrough(item):
+        return item
+
+    with pytest.raises(ValueError, match="bad bank"):
+        asyncio.run(asyncio.wait_for(run_stages(range(5), [passthrough, fail, passthrough]), timeout=5))
+
+def test_background_writer_limits_pending_writes():
+    from concurrent.futures import ThreadPoolExecutor
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def write(i):
+        with lock:
+            active.append(i)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(i)
+        return i
+
+    async def run():
+        with ThreadPoolExecutor(4) as executor:
+            writer = BackgroundWriter(executor, max_pending=2)
+            futures = [await writer.submit(write, i) for i in range(6)]
+            await writer.drain()
+            return [future.result() for future in futures]
+
+    assert asyncio.run(run()) == list(range(6))
+    assert max(peak) <= 2
+
+class FakeClassifier:
+    def __call__(self, descriptions, candidate_labels):
+        time.sleep(0.01)
+        return [{'labels': ['Other']} for _ in descriptions]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_calculate_totals_prints_banks_in_order(tmpdir, monkeypatch, capsys, workers):
+    monkeypatch.setattr(main, 'START_DATE', '2024-01-01')
+    monkeypatch.setattr(main, 'END_DATE', '2024-12-31')
+    monkeypatch.setattr(main, 'RESULTS_FOLDER', str(tmpdir.join('results')) + '/')
+    banks = []
+    for i, name in enumerate(['Openbank', 'Revolut', 'Openbank']):
+        path = str(tmpdir.join(f"{i}.csv"))
+        write_export(name, path, 300, seed=i, start='2024-01-01', end='2024-06-30')
+        bank = BankFactory.get_bank(name, path)
+        bank.name = f"{name}{i}"
+        bank.classifier = FakeClassifier()
+        banks.append(bank)
+
+    totals = main.calculate_totals(banks, workers=workers)
+    out = capsys.readouterr().out
+
+    positions = [out.index(f"Processing Bank: {bank.name}") for bank in banks]
+    assert positions == sorted(positions)
+    assert all((bank.df['Category'] == 'Other').all() for bank in banks)
+    assert totals[1] == pytest.approx(sum(-bank.df.loc[bank.df['Amount'] < 0, 'Amount'].sum() for bank in banks))
+    assert sorted(tmpdir.join('results').listdir()) == sorted(
+        tmpdir.join('results', f"{bank.name}_metrics.csv") for bank in banks)
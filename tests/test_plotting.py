@@ -0,0 +1,47 @@
+import os
+import pytest
+import pandas as pd
+from src.plotting import render_plots
+from src.schema import compact_transactions
+
+class FakeBank:
+    def __init__(self, name, amounts):
+        self.name = name
+        self.df = compact_transactions(pd.DataFrame({
+            'Date': pd.date_range('2024-06-01', periods=len(amounts), freq='5D'),
+            'Amount': amounts,
+            'Balance': pd.Series(amounts).cumsum() + 1000,
+            'Description': ['Mercadona'] * len(amounts),
+            'Bank': name,
+            'Category': ['Groceries', 'Dining'] * (len(amounts) // 2),
+        }))
+
+@pytest.fixture
+def banks():
+    return [FakeBank('Openbank', [-10.0, -20.0, 100.0, -5.0]), FakeBank('Revolut', [-1.0, 50.0])]
+
+@pytest.fixture
+def combined_metrics():
+    return pd.DataFrame({
+        'YearMonth': pd.PeriodIndex(['2024-06', '2024-07'], freq='M'),
+        'Total_Income': [150.0, 0.0],
+        'Total_Expense': [36.0, 0.0],
+    })
+
+def test_render_plots_writes_every_figure(tmpdir, banks, combined_metrics):
+    rendered = render_plots(banks, combined_metrics, str(tmpdir))
+    assert sorted(rendered) == ['balance_plot.png', 'expense_categories_by_bank_and_total.png', 'income_vs_expenses_plot.png']
+    for file_name in rendered:
+        assert os.path.getsize(tmpdir.join(file_name)) > 0
+
+def test_unchanged_figures_are_skipped(tmpdir, banks, combined_metrics):
+    render_plots(banks, combined_metrics, str(tmpdir))
+    assert render_plots(banks, combined_metrics, str(tmpdir)) == []
+
+    combined_metrics.loc[1, 'Total_Income'] = 10.0
+    assert render_plots(banks, combined_metrics, str(tmpdir)) == ['income_vs_expenses_plot.png']
+
+def test_render_plots_in_worker_processes(tmpdir, banks, combined_metrics):
+    rendered = render_plots(banks, combined_metrics, str(tmpdir), workers=3)
+    assert len(rendered) == 3
+    assert all(os.path.exists(tmpdir.join(file_name)) for file_name in rendered)
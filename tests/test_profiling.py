@@ -0,0 +1,77 @@
+import json
+import pytest
+import pandas as pd
+from src.base_bank import BaseBank
+from src.profiling import NullProfiler, Profiler, get_profiler, set_profiler
+
+class MockBank(BaseBank):
+    def parse_csv(self):
+        self.df = pd.DataFrame({'Date': ['2024-06-01 12:00:00', '2024-06-02 12:00:00'],
+                                'Amount': [100, -50],
+                                'Balance': [1000, 950],
+                                'Description': ['Salary', 'Mercadona']})
+
+class BrokenBank(BaseBank):
+    def parse_csv(self):
+        raise ValueError("bad export")
+
+class FakeClassifier:
+    def __call__(self, descriptions, candidate_labels):
+        return [{'labels': ['Other']} for _ in descriptions]
+
+@pytest.fixture
+def profiler():
+    profiler = set_profiler(Profiler())
+    yield profiler
+    set_profiler(None)
+
+def test_profiling_is_off_by_default():
+    assert isinstance(get_profiler(), NullProfiler)
+
+def test_stages_are_recorded(profiler):
+    bank = MockBank("MockBank", "mock.csv")
+    bank.classifier = FakeClassifier()
+    bank.to_standard()
+    bank.calculate_metrics()
+
+    stages = profiler.stages_frame()
+    assert list(stages['stage']) == ['parse_csv', 'to_standard', 'categorize', 'calculate_metrics']
+    assert (stages['bank'] == 'MockBank').all()
+    assert (stages['rows'] == 2).all()
+    assert (stages['wall_s'] >= 0).all() and (stages['process_peak_rss_mb'] > 0).all()
+    assert (stages['rss_mb'] > 0).all()
+    assert profiler.batches_frame()['size'].tolist() == [2]
+
+def test_stage_memory_is_per_stage(profiler):
+    with profiler.stage(None, 'small'):
+        pass
+    with profiler.stage(None, 'large'):
+        block = bytearray(64 * 2**20)
+        block[::4096] = b'x' * len(block[::4096])
+    del block
+    with profiler.stage(None, 'after'):
+        pass
+    small, large, after = profiler.stages
+    assert large['rss_delta_mb'] > 48
+    assert abs(small['rss_delta_mb']) < 16 and abs(after['rss_delta_mb']) < 16
+    # The block is freed, but the lifetime peak keeps reporting the large stage
+    assert after['process_peak_rss_mb'] - after['rss_mb'] > 48
+
+def test_swallowed_errors_are_reported(profiler):
+    BrokenBank("Broken", "broken.csv").to_standard()
+    record = profiler.stages[0]
+    assert record['stage'] == 'parse_csv'
+    assert 'bad export' in record['error']
+
+def test_write_report(tmpdir, profiler):
+    with profiler.stage('Openbank', 'parse_csv', rows=10):
+        pass
+    profiler.record_batch('Openbank', 32, 0.5)
+    profiler.write_report(str(tmpdir))
+
+    with open(tmpdir.join('profile.json')) as f:
+        report = json.load(f)
+    assert report['stages'][0]['rows'] == 10
+    assert report['classifier_batches']['count'] == 1
+    assert pd.read_csv(tmpdir.join('profile.csv'))['stage'].tolist() == ['parse_csv']
+    assert pd.read_csv(tmpdir.join('profile_batches.csv'))['size'].tolist() == [32]
@@ -0,0 +1,36 @@
+import pytest
+import pandas as pd
+from src.query import TransactionIndex
+from src.schema import compact_transactions
+
+@pytest.fixture
+def index():
+    df = compact_transactions(pd.DataFrame({
+        'Date': pd.to_datetime(['2024-06-03', '2024-06-01', '2024-06-10', '2024-07-02', '2024-07-05', '2024-08-01']),
+        'Amount': [-50.0, 1000.0, -120.0, -15.5, -300.0, -50.0],
+        'Balance': [950.0, 1000.0, 830.0, 814.5, 514.5, 464.5],
+        'Description': ['Supermercado Mercadona', 'Nomina', 'IKEA', 'Mercadona Express', 'Alquiler', 'MERCADONA'],
+        'Category': ['Groceries', 'Other', 'Shopping', 'Groceries', 'Rent', 'Groceries'],
+    }))
+    return TransactionIndex(df)
+
+def test_frame_is_sorted_once(index):
+    assert index.df['Date'].is_monotonic_increasing
+
+def test_date_range_query(index):
+    assert list(index.query(start_date='2024-06-02', end_date='2024-07-02')['Amount']) == [-50.0, -120.0, -15.5]
+
+def test_combined_filters(index):
+    result = index.query(start_date='2024-06-01', end_date='2024-07-31', categories=['Groceries', 'Rent'], max_amount=-20)
+    assert list(result['Description'].astype(str)) == ['Supermercado Mercadona', 'Alquiler']
+
+def test_description_filter_is_case_insensitive(index):
+    assert list(index.query(contains='mercadona')['Amount']) == [-50.0, -15.5, -50.0]
+    assert index.query(categories='Travel').empty
+
+def test_top_expenses(index):
+    top = index.top_expenses(3)
+    assert list(top['Amount']) == [-300.0, -120.0, -50.0]
+    assert list(index.top_expenses(2, categories='Groceries')['Amount']) == [-50.0, -50.0]
+    assert len(index.top_expenses(10)) == 5
+    assert index.top_expenses(0).empty
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+import pandas as pd
+import main
+from benchmarks.synthetic import synthetic_transactions, write_export
+from src.bank_factory import BankFactory
+from src.base_bank import BaseBank
+from src.recurring import RecurringCategorizer, detect_recurring, merchant_keys
+from src.rules import DEFAULT_RULES_PATH, get_rule_categorizer
+
+class MockBank(BaseBank):
+    def parse_csv(self):
+        pass
+
+class RecordingClassifier:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, descriptions, candidate_labels):
+        self.seen.extend(descriptions)
+        return [{'labels': ['Other']} for _ in descriptions]
+
+def transactions():
+    rows = []
+    rng = np.random.default_rng(0)
+    for month in range(1, 13):
+        # Same subscription paid from a different account after June, with a changing reference
+        rows.append((f'2024-{month:02d}-03', -12.99, f'NETFLIX.COM {4400 + month}', 'Openbank' if month <= 6 else 'Revolut'))
+        rows.append((f'2024-{month:02d}-01', -850.0, 'Alquiler piso', 'Openbank'))
+        rows.append((f'2024-{month:02d}-{(month * 7) % 27 + 1:02d}', -float(rng.integers(10, 90)), 'Mercadona', 'Openbank'))
+        rows.append((f'2024-{month:02d}-28', 2000.0, 'Nomina', 'Openbank'))
+    for week in range(20):
+        rows.append((pd.Timestamp('2024-01-05') + pd.Timedelta(days=7 * week), -20.0, 'Gym class', 'Revolut'))
+    for year in (2022, 2023, 2024):
+        rows.append((f'{year}-03-1{year % 3}', -49.0, 'Amazon Prime', 'Revolut'))
+    df = pd.DataFrame(rows, columns=['Date', 'Amount', 'Description', 'Bank'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df
+
+def test_merchant_keys_ignore_references():
+    keys = merchant_keys(pd.Series(['NETFLIX.COM 4401', ' netflix.com  4402 ']))
+    assert keys.nunique() == 1
+
+def test_detects_cadences_across_banks():
+    df = transactions()
+    charges, series = detect_recurring(df)
+    charges = charges.set_index('Description')
+
+    assert set(charges.index) == {'NETFLIX.COM 4412', 'Alquiler piso', 'Gym class', 'Amazon Prime'}
+    assert charges.loc['NETFLIX.COM 4412', 'Banks'] == 'Openbank, Revolut'
+    assert charges['Cadence'].to_dict() == {'NETFLIX.COM 4412': 'monthly', 'Alquiler piso': 'monthly',
+                                            'Gym class': 'weekly', 'Amazon Prime': 'yearly'}
+    assert charges.loc['Alquiler piso', 'Category'] == 'Rent'
+    assert charges.loc['Gym class', 'Annual_Cost'] == pytest.approx(20.0 * 52)
+    assert charges.loc['NETFLIX.COM 4412', 'Next_Expected'].date() == pd.Timestamp('2025-01-03').date()
+
+    # Income and irregular expenses are not part of any charge
+    assert (series[df['Description'].isin(['Mercadona', 'Nomina'])] == -1).all()
+    assert (series[df['Description'] == 'Gym class'] >= 0).all()
+
+def test_amount_changes_split_series():
+    df = transactions()
+    # A price change halfway through breaks the rent into two six-month series
+    df.loc[(df['Description'] == 'Alquiler piso') & (df['Date'] >= '2024-07-01'), 'Amount'] = -1000.0
+    charges, _ = detect_recurring(df)
+    assert (charges['Description'] == 'Alquiler piso').sum() == 2
+
+def test_empty_input():
+    charges, series = detect_recurring(transactions().iloc[0:0])
+    assert charges.empty and series.empty
+
+def test_recurring_rows_skip_the_model():
+    df = transactions()
+    bank = MockBank("MockBank", "mock.csv")
+    bank.classifier = RecordingClassifier()
+    bank.categorizers.append(RecurringCategorizer.from_transactions(df))
+    bank.df = df
+    bank.categorize_expenses()
+
+    assert sorted(bank.classifier.seen) == ['Mercadona', 'Nomina']
+    recurring = bank.df[bank.df['Category_Source'] == 'recurring']
+    assert set(recurring['Description'].str.split().str[0]) == {'NETFLIX.COM', 'Alquiler', 'Gym', 'Amazon'}
+    assert (recurring.loc[recurring['Description'] == 'Alquiler piso', 'Category'] == 'Rent').all()
+
+def test_income_with_a_recurring_description_is_not_labelled():
+    df = transactions()
+    # A refund from the gym shares the description of the weekly charge
+    df = pd.concat([df, pd.DataFrame([(pd.Timestamp('2024-03-01'), 20.0, 'Gym class', 'Revolut')],
+                                      columns=df.columns)], ignore_index=True)
+    bank = MockBank("MockBank", "mock.csv")
+    bank.classifier = RecordingClassifier()
+    bank.categorizers.append(RecurringCategorizer.from_transactions(df))
+    bank.df = df
+    bank.categorize_expenses()
+
+    gym = bank.df[bank.df['Description'] == 'Gym class']
+    assert (gym.loc[gym['Amount'] < 0, 'Category'] == 'Subscriptions').all()
+    assert gym.loc[gym['Amount'] > 0, ['Category', 'Category_Source']].values.tolist() == [['Other', 'model']]
+    assert sorted(bank.classifier.seen) == ['Gym class', 'Mercadona', 'Nomina']
+
+def test_recurring_relabels_transfers_but_not_merchant_rules():
+    rows = []
+    for month in range(1, 13):
+        rows.append((f'2024-{month:02d}-01', -700.0, 'Bizum a Juan casero', 'Openbank'))
+        rows.append((f'2024-{month:02d}-10', 25.0, 'Bizum de Ana', 'Openbank'))
+        rows.append((f'2024-{month:02d}-12', -45.0, 'Mercadona compra mensual', 'Openbank'))
+    df = pd.DataFrame(rows, columns=['Date', 'Amount', 'Description', 'Bank'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    bank = MockBank("MockBank", "mock.csv")
+    bank.classifier = RecordingClassifier()
+    bank.categorizers.extend([get_rule_categorizer(DEFAULT_RULES_PATH), RecurringCategorizer.from_transactions(df)])
+    bank.df = df
+    bank.categorize_expenses()
+
+    categories = bank.df.groupby('Description')[['Category', 'Category_Source']].first()
+    assert categories.loc['Bizum a Juan casero'].tolist() == ['Rent', 'recurring']
+    assert categories.loc['Bizum de Ana'].tolist() == ['Transfer', 'rules']
+    assert categories.loc['Mercadona compra mensual'].tolist() == ['Groceries', 'rules']
+
+def test_detection_replaces_the_previous_tier(tmpdir):
+    banks = []
+    for i, name in enumerate(['Openbank', 'Revolut']):
+        path = str(tmpdir.join(f"{i}.csv"))
+        write_export(name, path, 200, seed=i, start='2024-01-01', end='2024-12-31')
+        bank = BankFactory.get_bank(name, path)
+        bank.to_standard(categorize=False)
+        banks.append(bank)
+    first = main.detect_recurring_charges(banks)
+    second = main.detect_recurring_charges(banks)
+    for bank in banks:
+        tiers = [c for c in bank.categorizers if isinstance(c, RecurringCategorizer)]
+        assert tiers == [second] and tiers[0] is not first
+
+def test_scales_to_large_frames():
+    df = synthetic_transactions(200_000, cardinality=5000)
+    charges, series = detect_recurring(df)
+    assert len(series) == len(df)
+
+def test_calculate_totals_writes_recurring_charges(tmpdir, monkeypatch):
+    monkeypatch.setattr(main, 'START_DATE', '2024-01-01')
+    monkeypatch.setattr(main, 'END_DATE', '2024-12-31')
+    monkeypatch.setattr(main, 'RESULTS_FOLDER', str(tmpdir.join('results')) + '/')
+    banks = []
+    for i, name in enumerate(['Openbank', 'Revolut']):
+        path = str(tmpdir.join(f"{i}.csv"))
+        write_export(name, path, 200, seed=i, start='2024-01-01', end='2024-12-31')
+        bank = BankFactory.get_bank(name, path)
+        bank.classifier = RecordingClassifier()
+        banks.append(bank)
+    # A monthly charge appended to the Revolut export
+    with open(banks[1].csv_path, 'a') as f:
+        for month in range(1, 13):
+            f.write(f"CARD_PAYMENT,Current,2024-{month:02d}-15 10:00:00,2024-{month:02d}-15 10:00:00,"
+                    f"Spotify P{month},-10.99,0.00,EUR,COMPLETED,100.00\n")
+
+    main.calculate_totals(banks, recurring=True)
+
+    charges = pd.read_csv(tmpdir.join('results', 'recurring_charges.csv'))
+    assert 'Spotify P12' in set(charges['Description'])
+    spotify = banks[1].df[banks[1].df['Description'].str.startswith('Spotify')]
+    assert (spotify['Category'] == 'Subscriptions').all()
+    assert not any(description.startswith('Spotify') for description in banks[1].classifier.seen)
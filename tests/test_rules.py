@@ -0,0 +1,56 @@
+import pytest
+import pandas as pd
+from src.base_bank import BaseBank
+from src.rules import DEFAULT_RULES_PATH, RuleCategorizer, read_rules
+
+class MockBank(BaseBank):
+    def parse_csv(self):
+        pass
+
+class RecordingClassifier:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, descriptions, candidate_labels):
+        self.seen.extend(descriptions)
+        return [{'labels': ['Dining']} for _ in descriptions]
+
+def test_first_matching_rule_wins():
+    rules = RuleCategorizer([(r'\bbizum\b', 'Transfer'), (r'mercadona', 'Groceries')])
+    assert rules.match('supermercado mercadona bizum') == 'Transfer'
+    assert rules.match('supermercado mercadona') == 'Groceries'
+    assert rules.match('pasteleria la 28') is None
+
+def test_rules_with_group_references_still_match():
+    rules = RuleCategorizer([(r'zzz', 'Other'), (r'(ab)\1', 'Transfer'), (r'ab', 'Groceries'),
+                             (r'(?P<x>q)(?P=x)', 'Dining')])
+    assert rules.match('xxabab') == 'Transfer'
+    assert rules.match('xxab') == 'Groceries'
+    assert rules.match('qq') == 'Dining'
+    # Order is kept across the separately matched rules
+    assert rules.match('zzz abab') == 'Other'
+
+def test_invalid_patterns_name_the_rule():
+    with pytest.raises(ValueError, match="'\\(oops' for category 'Transfer'"):
+        RuleCategorizer([('(oops', 'Transfer')])
+
+def test_empty_rule_set_matches_nothing():
+    assert RuleCategorizer([]).categorize(['bizum']) == [None]
+
+def test_default_rules_file_is_valid():
+    rules = read_rules(DEFAULT_RULES_PATH)
+    assert rules
+    categorizer = RuleCategorizer(rules)
+    bank = MockBank("MockBank", "mock.csv")
+    assert set(categorizer.categories) <= set(bank.candidate_labels)
+
+def test_rules_run_before_the_model():
+    bank = MockBank("MockBank", "mock.csv")
+    bank.classifier = RecordingClassifier()
+    bank.categorizers.append(RuleCategorizer([(r'\bbizum\b', 'Transfer')]))
+    bank.df = pd.DataFrame({'Description': ["BIZUM DE PEPE", "Pasteleria La 28"]})
+    bank.categorize_expenses()
+
+    assert bank.classifier.seen == ["Pasteleria La 28"]
+    assert list(bank.df['Category']) == ["Transfer", "Dining"]
+    assert list(bank.df['Category_Source']) == ["rules", "model"]
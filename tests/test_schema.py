@@ -0,0 +1,32 @@
+import pytest
+import pandas as pd
+from src.schema import combine_transactions, compact_transactions
+
+def make_frame(bank, descriptions, categories):
+    return pd.DataFrame({
+        'Date': pd.to_datetime(['2024-06-01'] * len(descriptions)),
+        'Amount': [-10] * len(descriptions),
+        'Balance': [100] * len(descriptions),
+        'Description': descriptions,
+        'Bank': bank,
+        'Category': categories,
+    })
+
+def test_compact_transactions_enforces_schema():
+    df = compact_transactions(make_frame('Openbank', ['Mercadona', 'Mercadona'], ['Groceries', 'Groceries']))
+    assert df['Amount'].dtype == 'float64'
+    assert df['Balance'].dtype == 'float64'
+    for column in ['Description', 'Bank', 'Category']:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert list(df['Description'].cat.categories) == ['Mercadona']
+
+def test_combine_transactions_keeps_categoricals():
+    openbank = compact_transactions(make_frame('Openbank', ['Mercadona', 'Bizum'], ['Groceries', 'Transfer']))
+    revolut = compact_transactions(make_frame('Revolut', ['Netflix'], ['Subscriptions']))
+    combined = combine_transactions([openbank, revolut])
+
+    assert list(combined.columns) == list(openbank.columns)
+    assert isinstance(combined['Description'].dtype, pd.CategoricalDtype)
+    assert list(combined['Bank'].astype(str)) == ['Openbank', 'Openbank', 'Revolut']
+    assert list(combined['Description'].astype(str)) == ['Mercadona', 'Bizum', 'Netflix']
+    assert list(combined['Amount']) == [-10.0, -10.0, -10.0]
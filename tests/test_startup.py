@@ -0,0 +1,14 @@
+import os
+import pytest
+from benchmarks.bench_imports import heavy_imports, import_times
+
+# Set IMPORT_BUDGET_MS to also fail when `import main` gets slower than the budget
+IMPORT_BUDGET_MS = os.environ.get('IMPORT_BUDGET_MS')
+
+@pytest.mark.parametrize("module", ["main", "src.base_bank", "src.bank_factory", "src.plotting", "src.metrics"])
+def test_heavy_dependencies_are_not_imported_up_front(module):
+    assert heavy_imports(import_times(module)) == []
+
+@pytest.mark.skipif(not IMPORT_BUDGET_MS, reason="IMPORT_BUDGET_MS not set")
+def test_main_import_budget():
+    assert import_times('main')['main'][1] / 1000 <= float(IMPORT_BUDGET_MS)
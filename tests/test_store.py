@@ -0,0 +1,77 @@
+import os
+import pytest
+import pandas as pd
+from src.base_bank import BaseBank
+from src.store import load_banks_from_store, read_metrics, read_transactions, write_metrics, write_transactions
+from src.metrics import period_metrics
+
+class UnparseableBank(BaseBank):
+    def parse_csv(self):
+        raise AssertionError("parse_csv should not be called when loading from the store")
+
+@pytest.fixture
+def transactions():
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-06-01 10:00', '2024-06-15 12:00', '2024-07-01 09:00', '2024-08-03 18:00']),
+        'Amount': [100.0, -50.0, -20.0, -5.5],
+        'Balance': [1000.0, 950.0, 930.0, 924.5],
+        'Description': ['Salary', 'Mercadona', 'Netflix', 'Cafe'],
+        'Bank': 'Openbank',
+        'Category': ['Other', 'Groceries', 'Subscriptions', 'Dining'],
+    })
+    df['YearMonth'] = df['Date'].dt.to_period('M')
+    return df
+
+def test_round_trip_is_typed(tmpdir, transactions):
+    store = str(tmpdir)
+    write_transactions(transactions, store, 'Openbank')
+    df = read_transactions(store)
+
+    assert len(df) == 4
+    assert pd.api.types.is_datetime64_any_dtype(df['Date'])
+    assert df['Amount'].dtype == 'float64'
+    assert isinstance(df['Category'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['Bank'].dtype, pd.CategoricalDtype)
+    assert list(df['YearMonth'].astype(str)) == ['2024-06', '2024-06', '2024-07', '2024-08']
+    assert os.path.isdir(os.path.join(store, 'transactions', 'Bank=Openbank', 'YearMonth=2024-07'))
+
+def test_partition_and_column_pruning(tmpdir, transactions):
+    store = str(tmpdir)
+    write_transactions(transactions, store, 'Openbank')
+    write_transactions(transactions, store, 'Revolut')
+
+    df = read_transactions(store, ['Revolut'], '2024-06-10', '2024-07-31', columns=['Amount'])
+    assert list(df.columns) == ['Date', 'Amount']
+    assert list(df['Amount']) == [-50.0, -20.0]
+
+def test_rewriting_a_bank_replaces_its_rows(tmpdir, transactions):
+    store = str(tmpdir)
+    write_transactions(transactions, store, 'Openbank')
+    write_transactions(transactions.iloc[:2], store, 'Openbank')
+    assert len(read_transactions(store, ['Openbank'])) == 2
+
+def test_metrics_round_trip(tmpdir, transactions):
+    store = str(tmpdir)
+    metrics = period_metrics(transactions)
+    write_metrics(metrics, store, 'Openbank')
+    pd.testing.assert_frame_equal(read_metrics(store, 'Openbank'), metrics)
+
+def test_banks_load_from_store_without_parsing(tmpdir, transactions):
+    store = str(tmpdir)
+    write_transactions(transactions, store, 'Openbank')
+    bank = UnparseableBank('Openbank', 'missing.csv')
+    load_banks_from_store([bank], store, start_date='2024-06-01', end_date='2024-07-31')
+
+    metrics = bank.calculate_metrics()
+    assert list(metrics['Total_Expense']) == [50.0, 20.0]
+
+def test_banks_missing_from_the_store_are_left_to_parse(tmpdir, transactions):
+    store = str(tmpdir)
+    banks = [UnparseableBank('Revolut', 'missing.csv')]
+    load_banks_from_store(banks, str(tmpdir.join('no_store')))
+    assert banks[0].df is None
+
+    write_transactions(transactions, store, 'Openbank')
+    banks = [UnparseableBank('Openbank', 'missing.csv'), UnparseableBank('Revolut', 'missing.csv')]
+    load_banks_from_store(banks, store)
+    assert len(banks[0].df) == 4 and banks[1].df is None
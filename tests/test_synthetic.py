@@ -0,0 +1,30 @@
+import pytest
+from benchmarks.synthetic import spanish_numbers, write_export
+from src.openbank import Openbank
+from src.revolut import Revolut
+
+def test_spanish_numbers():
+    assert spanish_numbers([1766.92, -6.5, 1234567.0]).tolist() == ["1.766,92", "-6,50", "1.234.567,00"]
+
+@pytest.mark.parametrize("bank_class", [Openbank, Revolut])
+def test_exports_round_trip(tmpdir, bank_class):
+    path = str(tmpdir.join("export.csv"))
+    expected = write_export(bank_class.__name__, path, 500, seed=3, cardinality=40)
+
+    bank = bank_class(bank_class.__name__, path)
+    bank.parse_csv()
+    df = bank.df
+
+    assert len(df) == 500
+    assert df['Description'].str.strip().nunique() == expected['Description'].nunique() <= 40
+    assert df['Amount'].sum() == pytest.approx(expected['Amount'].sum())
+    assert sorted(df['Balance']) == pytest.approx(sorted(expected['Balance']))
+    assert df['Date'].max().date() == expected['Date'].max().date()
+
+def test_exports_are_seeded(tmpdir):
+    first, second, other = (str(tmpdir.join(f"{i}.csv")) for i in range(3))
+    write_export('Openbank', first, 100, seed=1)
+    write_export('Openbank', second, 100, seed=1)
+    write_export('Openbank', other, 100, seed=2)
+    read = lambda path: open(path, encoding='utf-8-sig').read()
+    assert read(first) == read(second) != read(other)
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.openbank import Openbank
+from src.timeline import BalanceTimeline, downsample_lttb, downsample_minmax
+
+def frame(dates, amounts, balances):
+    return pd.DataFrame({'Date': pd.to_datetime(dates), 'Amount': amounts, 'Balance': balances})
+
+@pytest.fixture
+def timeline():
+    openbank = frame(['2024-06-01 09:00', '2024-06-01 18:00', '2024-06-04 10:00'], [-10.0, -5.0, 100.0], [990.0, 985.0, 1085.0])
+    revolut = frame(['2024-06-03 12:00', '2024-06-06 12:00'], [-20.0, 50.0], [80.0, 130.0])
+    return BalanceTimeline(['Openbank', 'Revolut'], [openbank, revolut])
+
+def test_banks_are_aligned_on_a_union_index(timeline):
+    assert list(timeline.index) == list(pd.date_range('2024-06-01', '2024-06-06'))
+    assert list(timeline.bank(0)) == [985.0, 985.0, 985.0, 1085.0, 1085.0, 1085.0]
+    # Revolut holds its opening balance (80 + 20) before its first transaction
+    assert list(timeline.bank(1)) == [100.0, 100.0, 80.0, 80.0, 80.0, 130.0]
+    assert not timeline.total().isna().any()
+
+def test_balance_on(timeline):
+    assert timeline.balance_on('2024-06-02') == 1085.0
+    assert timeline.balance_on('2024-06-04 23:00') == 1165.0
+    assert timeline.balance_on('2024-06-30') == 1215.0
+    assert timeline.balance_on('2024-05-01') == 1000.0 + 100.0
+    assert timeline.balance_on('2024-06-03', bank=1) == 80.0
+
+def test_downsampling_keeps_endpoints_and_extremes():
+    index = pd.date_range('2000-01-01', periods=10_000, freq='D')
+    values = np.sin(np.arange(10_000) / 50.0)
+    values[5_000] = 10.0
+    series = pd.Series(values, index=index)
+
+    lttb = downsample_lttb(series, 500)
+    assert len(lttb) == 500
+    assert lttb.index[0] == index[0] and lttb.index[-1] == index[-1]
+    assert lttb.max() == 10.0
+
+    minmax = downsample_minmax(series, 500)
+    assert len(minmax) <= 500
+    assert minmax.max() == 10.0 and minmax.min() == series.min()
+
+def test_short_series_are_not_downsampled():
+    series = pd.Series([1.0, 2.0, 3.0])
+    assert downsample_lttb(series, 10) is series
+    assert downsample_minmax(series, 10) is series
+
+def test_newest_first_same_day_export():
+    # Openbank lists the 2023-12-27 movements newest first: +6.50 -> 1766.92 happened after 13.00 -> 1760.42
+    bank = Openbank("Openbank", "data/openbank_test.csv")
+    bank.to_standard(categorize=False)
+    timeline = BalanceTimeline.from_banks([bank])
+    assert list(timeline.bank(0)) == [1766.92]
+    assert timeline.openings[0] == pytest.approx(1747.42)
+    assert timeline.balance_on('2023-12-01') == pytest.approx(1747.42)